@@ -1,18 +1,34 @@
 from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+import hashlib
 import os
-import shutil
+import tempfile
 from rag import analyze_cv
+from singleflight import SingleFlight
 
 app = FastAPI()
 
-@app.post("/api/evaluate/")
-async def analyze(cv: UploadFile = File(...), jd: str = Form(...)):
-    temp_path = f"temp_{cv.filename}"
-    with open(temp_path, "wb") as buffer:
-        shutil.copyfileobj(cv.file, buffer)
+# Identical CV/JD pairs that arrive together share one analysis
+evaluations = SingleFlight()
 
-    result = analyze_cv(temp_path, jd)
+def analyze_cv_bytes(content: bytes, suffix: str, jd: str) -> dict:
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        tmp.write(content)
+        temp_path = tmp.name
+    try:
+        return analyze_cv(temp_path, jd)
+    finally:
+        os.remove(temp_path)
 
-    os.remove(temp_path)
+@app.post("/api/evaluate/")
+async def analyze(cv: UploadFile = File(...), jd: str = Form(...)):
+    content = await cv.read()
+    suffix = os.path.splitext(cv.filename or "")[1].lower() or ".pdf"
+    key = (hashlib.sha256(content).hexdigest(), suffix, hashlib.sha256(jd.encode()).hexdigest())
+    result = await evaluations.do(key, run_in_threadpool, analyze_cv_bytes, content, suffix, jd)
     return JSONResponse(content=result)
+
+@app.get("/api/stats/")
+async def stats():
+    return {"evaluations": evaluations.stats()}
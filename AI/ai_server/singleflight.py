@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight task.
+    Cancelling one caller only stops that caller from waiting; the shared
+    work keeps running for the others.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args) -> Any:
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args))
+            self.calls[key] = task
+            self.started += 1
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        if self.calls.get(key) is task:
+            del self.calls[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "in_flight": len(self.calls),
+        }
@@ -16,3 +16,79 @@ CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET")
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+
+# Bulk CV upload configuration
+BULK_UPLOAD_CONCURRENCY = int(os.getenv("BULK_UPLOAD_CONCURRENCY", "4"))
+
+# Live progress events configuration
+PROGRESS_BUFFER_SIZE = int(os.getenv("PROGRESS_BUFFER_SIZE", "100"))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+# AI service resilience configuration
+UPLOAD_DEADLINE_SECONDS = float(os.getenv("UPLOAD_DEADLINE_SECONDS", "90"))
+AI_REQUEST_TIMEOUT_SECONDS = float(os.getenv("AI_REQUEST_TIMEOUT_SECONDS", "60"))
+AI_LOCAL_FALLBACK_TIMEOUT_SECONDS = float(os.getenv("AI_LOCAL_FALLBACK_TIMEOUT_SECONDS", "120"))
+AI_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("AI_CIRCUIT_FAILURE_THRESHOLD", "3"))
+AI_CIRCUIT_RESET_SECONDS = float(os.getenv("AI_CIRCUIT_RESET_SECONDS", "30"))
+AI_HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("AI_HEALTH_CHECK_TIMEOUT_SECONDS", "5"))
+
+# Candidate list pagination
+CANDIDATE_PAGE_SIZE_DEFAULT = int(os.getenv("CANDIDATE_PAGE_SIZE_DEFAULT", "50"))
+CANDIDATE_PAGE_SIZE_MAX = int(os.getenv("CANDIDATE_PAGE_SIZE_MAX", "200"))
+
+# Dashboard rollups
+ROLLUP_RECONCILE_INTERVAL_SECONDS = float(os.getenv("ROLLUP_RECONCILE_INTERVAL_SECONDS", "3600"))
+
+# Authenticated principal cache
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+
+# Password hashing
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+
+# API request logging
+API_LOG_BATCH_SIZE = int(os.getenv("API_LOG_BATCH_SIZE", "500"))
+API_LOG_FLUSH_SECONDS = float(os.getenv("API_LOG_FLUSH_SECONDS", "1"))
+API_LOG_MAX_BUFFER = int(os.getenv("API_LOG_MAX_BUFFER", "10000"))
+API_LOG_RETENTION_DAYS = int(os.getenv("API_LOG_RETENTION_DAYS", "30"))
+API_METRICS_MINUTE_RETENTION_DAYS = int(os.getenv("API_METRICS_MINUTE_RETENTION_DAYS", "7"))
+
+# Dashboard response cache
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+RESPONSE_CACHE_MAX_SIZE = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "5000"))
+
+# MongoDB connection pool and read routing
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "10000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))  # 0 = no timeout
+# Comma separated, e.g. "zstd,snappy,zlib"; zstd and snappy need their Python packages
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+MONGO_ANALYTICS_READ_PREFERENCE = os.getenv("MONGO_ANALYTICS_READ_PREFERENCE", "secondaryPreferred")
+MONGO_ANALYTICS_MAX_STALENESS_SECONDS = int(os.getenv("MONGO_ANALYTICS_MAX_STALENESS_SECONDS", "-1"))
+
+# Candidate export
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+# Debug mode exposes query plans on ranking endpoints
+DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+# Job role cascade cleanup
+CASCADE_BATCH_SIZE = int(os.getenv("CASCADE_BATCH_SIZE", "500"))
+CASCADE_BATCH_DELAY_SECONDS = float(os.getenv("CASCADE_BATCH_DELAY_SECONDS", "0.5"))
+CASCADE_LEASE_SECONDS = float(os.getenv("CASCADE_LEASE_SECONDS", "120"))
+ORPHAN_SWEEP_INTERVAL_SECONDS = float(os.getenv("ORPHAN_SWEEP_INTERVAL_SECONDS", "21600"))
+ORPHAN_SWEEP_ARCHIVE = os.getenv("ORPHAN_SWEEP_ARCHIVE", "true").lower() == "true"
+
+# CV storage
+CV_STORAGE_BACKEND = os.getenv("CV_STORAGE_BACKEND", "cloudinary")
+LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "storage/cv_uploads")
+LOCAL_STORAGE_URL_PATH = os.getenv("LOCAL_STORAGE_URL_PATH", "/files")
+LOCAL_STORAGE_BASE_URL = os.getenv("LOCAL_STORAGE_BASE_URL", "http://localhost:8000/files")
+# Per CV, for single uploads and every file or zip entry of a bulk upload
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
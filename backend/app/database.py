@@ -1,34 +1,64 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.read_preferences import read_pref_mode_from_name, make_read_preference
 from typing import Optional
 import os
 from dotenv import load_dotenv
 import logging
+from app.indexes import ensure_indexes
+from app.utils.mongo_pool import pool_monitor
+from app.config import (
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_COMPRESSORS,
+    MONGO_ANALYTICS_READ_PREFERENCE,
+    MONGO_ANALYTICS_MAX_STALENESS_SECONDS
+)
 
 load_dotenv()
 
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "cv_align")
 
+def client_options() -> dict:
+    """Pool sizing, timeouts and compression for the MongoDB client."""
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "event_listeners": [pool_monitor],
+    }
+    if MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = MONGO_SOCKET_TIMEOUT_MS
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    return options
+
+# Dashboards and aggregations over data that tolerates replication lag
+ANALYTICS_READ_PREFERENCE = make_read_preference(
+    read_pref_mode_from_name(MONGO_ANALYTICS_READ_PREFERENCE),
+    None,
+    max_staleness=MONGO_ANALYTICS_MAX_STALENESS_SECONDS
+)
+
 class Database:
     client = None  # type: Optional[AsyncIOMotorClient]
     db = None
 
     @classmethod
     async def connect_db(cls):
-        cls.client = AsyncIOMotorClient(MONGODB_URL)
+        cls.client = AsyncIOMotorClient(MONGODB_URL, **client_options())
         cls.db = cls.client[DATABASE_NAME]
         
-        # Initialize collections and indexes
-        if "companies" not in await cls.db.list_collection_names():
-            await cls.db.create_collection("companies")
-            await cls.db.companies.create_index("website", unique=True)
-            logging.info("Initialized companies collection with indexes")
-        
-        # Initialize job_roles collection
-        if "job_roles" not in await cls.db.list_collection_names():
-            await cls.db.create_collection("job_roles")
-            await cls.db.job_roles.create_index([("company_id", 1), ("title", 1)], unique=True)
-            logging.info("Initialized job_roles collection with indexes")
+        # Create and reconcile all registered indexes
+        await ensure_indexes(cls.db)
         
         logging.info("Connected to MongoDB successfully")
 
@@ -42,6 +72,15 @@ class Database:
     def get_collection(cls, collection_name: str):
         return cls.db[collection_name]
 
+    @classmethod
+    def get_analytics_collection(cls, collection_name: str):
+        """
+        The collection with the analytics read preference (secondaries when
+        available). Only for reads that tolerate lag; writes and reads that
+        must see the caller's own writes use get_collection.
+        """
+        return cls.db.get_collection(collection_name, read_preference=ANALYTICS_READ_PREFERENCE)
+
 db = Database()
 
 async def get_database():
@@ -0,0 +1,148 @@
+"""Declarative registry of the MongoDB indexes the application relies on."""
+import logging
+from typing import List
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+from app.config import API_LOG_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+# Index options that define an index; anything else (v, ns, background) is ignored when comparing
+INDEX_OPTIONS = ["unique", "sparse", "partialFilterExpression", "expireAfterSeconds", "weights", "default_language"]
+
+INDEXES = {
+    "companies": [
+        IndexModel([("website", ASCENDING)], name="website_1", unique=True),
+        IndexModel([("code", ASCENDING)], name="code_1"),
+    ],
+    "job_roles": [
+        IndexModel([("company_id", ASCENDING), ("title", ASCENDING)], name="company_id_1_title_1", unique=True),
+        IndexModel([("company_id", ASCENDING), ("applications_count", DESCENDING)], name="company_id_1_applications_count_-1"),
+    ],
+    "candidates": [
+        IndexModel(
+            [("job_role_id", ASCENDING), ("content_hash", ASCENDING)],
+            name="job_role_id_1_content_hash_1",
+            unique=True,
+            partialFilterExpression={"content_hash": {"$exists": True}}
+        ),
+        IndexModel(
+            [("recruiter_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="recruiter_id_1_created_at_-1__id_-1"
+        ),
+        IndexModel(
+            [("job_role_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="job_role_id_1_created_at_-1__id_-1"
+        ),
+        IndexModel(
+            [("company_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="company_id_1_created_at_-1__id_-1"
+        ),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_-1__id_-1"),
+        # Top-k ranking per role reads only k entries, with or without a status filter
+        IndexModel(
+            [("job_role_id", ASCENDING), ("status", ASCENDING), ("ats_score", DESCENDING), ("_id", DESCENDING)],
+            name="job_role_id_1_status_1_ats_score_-1__id_-1"
+        ),
+        IndexModel(
+            [("job_role_id", ASCENDING), ("ats_score", DESCENDING), ("_id", DESCENDING)],
+            name="job_role_id_1_ats_score_-1__id_-1"
+        ),
+        # MongoDB allows one text index per collection; every weighted field must be listed
+        IndexModel(
+            [("strengths", TEXT), ("weaknesses", TEXT), ("feedback", TEXT), ("degree", TEXT), ("course", TEXT)],
+            name="candidate_text",
+            weights={"strengths": 5, "degree": 3, "course": 3, "weaknesses": 2, "feedback": 1},
+            default_language="english"
+        ),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_1", unique=True),
+        # Also serves (company_code, role) lookups; top-k recruiters read only k entries
+        IndexModel(
+            [("company_code", ASCENDING), ("role", ASCENDING), ("accuracy", DESCENDING), ("_id", ASCENDING)],
+            name="company_code_1_role_1_accuracy_-1__id_1"
+        ),
+        IndexModel([("role", ASCENDING)], name="role_1"),
+    ],
+    "api_logs": [
+        # Raw logs are only kept for debugging; dashboards read api_metrics
+        IndexModel([("timestamp", ASCENDING)], name="timestamp_1", expireAfterSeconds=API_LOG_RETENTION_DAYS * 86400),
+        IndexModel([("path", ASCENDING), ("timestamp", ASCENDING)], name="path_1_timestamp_1"),
+    ],
+    "background_jobs": [
+        IndexModel([("status", ASCENDING), ("job_role_id", ASCENDING)], name="status_1_job_role_id_1"),
+        # At most one queued or running cascade per job role
+        IndexModel(
+            [("job_role_id", ASCENDING)],
+            name="job_role_id_1_active",
+            unique=True,
+            partialFilterExpression={"active": True}
+        ),
+    ],
+    "candidates_archive": [
+        IndexModel([("job_role_id", ASCENDING)], name="job_role_id_1"),
+    ],
+    "api_metrics": [
+        IndexModel([("granularity", ASCENDING), ("bucket", ASCENDING)], name="granularity_1_bucket_1"),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_1", expireAfterSeconds=0),
+    ],
+}
+
+
+def _index_spec(document: dict) -> tuple:
+    key = document["key"]
+    key = list(key.items()) if hasattr(key, "items") else list(key)
+    if "weights" in document:
+        # MongoDB stores text fields as _fts/_ftsx and lists them in weights, so compare the weights instead
+        key = [(field, direction) for field, direction in key if direction != "text" and field not in ("_fts", "_ftsx")]
+    options = {option: document[option] for option in INDEX_OPTIONS if option in document}
+    return [(field, int(direction) if isinstance(direction, (int, float)) else direction) for field, direction in key], options
+
+
+async def ensure_indexes(db):
+    """
+    Create every registered index that is missing. Runs in every worker at
+    startup, so it never drops anything: indexes whose definition changed
+    are reported and rebuilt by migrations/rebuild_indexes.py, and an index
+    that cannot be built (e.g. unique over duplicate data) is logged without
+    stopping startup. Indexes that exist in MongoDB but not in the registry
+    are reported too.
+    """
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        for model in models:
+            document = model.document
+            name = document["name"]
+            if name in existing:
+                if _index_spec(existing[name]) != _index_spec(document):
+                    logger.warning(
+                        f"Index {collection_name}.{name} differs from the registry; "
+                        "run migrations/rebuild_indexes.py to rebuild it"
+                    )
+                continue
+            try:
+                await collection.create_indexes([model])
+                logger.info(f"Created index {collection_name}.{name}")
+            except OperationFailure as e:
+                logger.error(f"Could not create index {collection_name}.{name}: {str(e)}")
+        registered = {model.document["name"] for model in models}
+        for name in existing:
+            if name != "_id_" and name not in registered:
+                logger.warning(f"Index {collection_name}.{name} is not in the index registry")
+
+
+async def rebuild_changed_indexes(db) -> List[str]:
+    """Drop and recreate the registered indexes whose definition changed; returns their names."""
+    rebuilt = []
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        for model in models:
+            name = model.document["name"]
+            if name in existing and _index_spec(existing[name]) != _index_spec(model.document):
+                await collection.drop_index(name)
+                await collection.create_indexes([model])
+                rebuilt.append(f"{collection_name}.{name}")
+    return rebuilt
@@ -1,11 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import connect_to_mongo, close_mongo_connection, Database
+from fastapi.staticfiles import StaticFiles
+from app.database import connect_to_mongo, close_mongo_connection
 from app.routes import company, auth, job_role, users, candidate
-from app.routes import evaluate
+from app.routes import evaluate, events, jobs
+from app.config import (
+    ROLLUP_RECONCILE_INTERVAL_SECONDS,
+    ORPHAN_SWEEP_INTERVAL_SECONDS,
+    CASCADE_LEASE_SECONDS,
+    CV_STORAGE_BACKEND,
+    LOCAL_STORAGE_DIR,
+    LOCAL_STORAGE_URL_PATH
+)
+from app.utils.rollups import reconcile_rollups_periodically
+from app.utils.cascade import cascade_runner, resume_cascades_periodically, sweep_orphans_periodically
+from app.utils.api_log import APILogMiddleware, api_log_writer
+import asyncio
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
-from datetime import datetime
 
 # --- Logging Configuration ---
 logging.basicConfig(level=logging.INFO)
@@ -22,10 +33,32 @@ app = FastAPI(
 @app.on_event("startup")
 async def startup():
     await connect_to_mongo()
+    api_log_writer.start()
+    if ROLLUP_RECONCILE_INTERVAL_SECONDS > 0:
+        app.state.rollup_task = asyncio.create_task(
+            reconcile_rollups_periodically(ROLLUP_RECONCILE_INTERVAL_SECONDS)
+        )
+    await cascade_runner.resume()
+    app.state.cascade_resume_task = asyncio.create_task(resume_cascades_periodically(CASCADE_LEASE_SECONDS))
+    if ORPHAN_SWEEP_INTERVAL_SECONDS > 0:
+        app.state.orphan_sweep_task = asyncio.create_task(
+            sweep_orphans_periodically(ORPHAN_SWEEP_INTERVAL_SECONDS)
+        )
     logger.info("Application startup complete")
 
 @app.on_event("shutdown")
 async def shutdown():
+    rollup_task = getattr(app.state, "rollup_task", None)
+    if rollup_task:
+        rollup_task.cancel()
+    orphan_sweep_task = getattr(app.state, "orphan_sweep_task", None)
+    if orphan_sweep_task:
+        orphan_sweep_task.cancel()
+    cascade_resume_task = getattr(app.state, "cascade_resume_task", None)
+    if cascade_resume_task:
+        cascade_resume_task.cancel()
+    await cascade_runner.stop()
+    await api_log_writer.stop()
     await close_mongo_connection()
     logger.info("Application shutdown complete")
 
@@ -39,25 +72,7 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
-class APILogMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        start_time = datetime.utcnow()
-        response = await call_next(request)
-        end_time = datetime.utcnow()
-        duration = (end_time - start_time).total_seconds()
-        # Log to MongoDB
-        try:
-            await Database.get_collection("api_logs").insert_one({
-                "path": request.url.path,
-                "method": request.method,
-                "timestamp": start_time,
-                "duration": duration
-            })
-        except Exception as e:
-            pass  # Avoid breaking the app if logging fails
-        return response
-
-app.add_middleware(APILogMiddleware)
+app.add_middleware(APILogMiddleware, writer=api_log_writer)
 
 # --- Routers ---
 app.include_router(company.router)
@@ -66,6 +81,12 @@ app.include_router(job_role.router, prefix="/job-roles", tags=["Job Roles"])
 app.include_router(users.router, prefix="/users")
 app.include_router(candidate.router)
 app.include_router(evaluate.router, prefix="/api")
+app.include_router(events.router, prefix="/events", tags=["Events"])
+app.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+
+# Serve CVs stored by the local storage backend
+if CV_STORAGE_BACKEND == "local":
+    app.mount(LOCAL_STORAGE_URL_PATH, StaticFiles(directory=LOCAL_STORAGE_DIR, check_dir=False), name="cv_files")
 
 # --- Root Endpoint ---
 @app.get("/")
@@ -0,0 +1,18 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Optional
+
+class BackgroundJobResponse(BaseModel):
+    id: str
+    type: str
+    reason: str
+    job_role_id: str
+    company_id: Optional[str] = None
+    mode: str
+    status: str
+    total: Optional[int] = None
+    processed: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
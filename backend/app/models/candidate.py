@@ -16,6 +16,7 @@ class CandidateBase(BaseModel):
     recruiter_id: str
     job_role_id: Optional[str] = None
     job_role_title: str
+    company_id: Optional[str] = None
     status: str = "uploaded"  # uploaded, selected, rejected, shortlisted
     created_at: Optional[datetime] = None
 
@@ -26,4 +27,48 @@ class CandidateCreate(BaseModel):
 class CandidateResponse(CandidateBase):
     id: str
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class CandidateSummary(BaseModel):
+    """Candidate fields for list views, without the long feedback texts."""
+    id: str
+    candidate_name: str
+    degree: Optional[str] = None
+    course: Optional[str] = None
+    cgpa: Optional[str] = None
+    ats_score: Optional[int] = None
+    strengths: Optional[List[str]] = []
+    weaknesses: Optional[List[str]] = []
+    cv_url: Optional[HttpUrl] = None
+    recruiter_id: str
+    job_role_id: Optional[str] = None
+    job_role_title: Optional[str] = None
+    company_id: Optional[str] = None
+    status: str = "uploaded"
+    created_at: Optional[datetime] = None
+
+class CandidateSearchResult(CandidateSummary):
+    score: float
+
+class CandidateSearchPage(BaseModel):
+    items: List[CandidateSearchResult]
+    next_cursor: Optional[str] = None
+
+class CandidateBulkStatusUpdate(BaseModel):
+    candidate_ids: List[str] = Field(..., min_length=1, max_length=500)
+    status: str
+
+class CandidateBulkStatusResult(BaseModel):
+    status: str
+    updated: List[str] = []
+    unchanged: List[str] = []
+    not_found: List[str] = []
+    forbidden: List[str] = []
+    conflicted: List[str] = []
+
+class CandidatePage(BaseModel):
+    items: List[CandidateSummary]
+    next_cursor: Optional[str] = None
+
+class CandidateRankingPage(CandidatePage):
+    explain: Optional[dict] = None
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from datetime import timedelta
+import time
 from typing import Optional
 from ..models.user import UserCreate, User, UserRole
 from ..database import Database
 from ..utils.mongo_utils import convert_id
+from ..utils.principal_cache import principal_cache
+from ..utils.response_cache import bump_company_versions
 from ..auth.utils import (
-    verify_password,
-    get_password_hash,
+    hash_password,
+    verify_and_update_password,
     create_access_token,
     verify_token,
     ACCESS_TOKEN_EXPIRE_MINUTES
@@ -15,16 +18,37 @@ from ..auth.utils import (
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     payload = verify_token(token)
+    cached_user = principal_cache.get(payload["sub"])
+    if cached_user is not None:
+        return cached_user
+    epoch = principal_cache.epoch
+    started = time.perf_counter()
     user = await Database.get_collection("users").find_one({"email": payload["sub"]})
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-    return User(**convert_id(user))
+    current_user = User(**convert_id(user))
+    principal_cache.set(payload["sub"], current_user, epoch, time.perf_counter() - started)
+    return current_user
+
+async def get_current_user_from_header_or_query(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None)
+) -> User:
+    """Authenticate from the Authorization header, or the access_token query parameter for EventSource clients."""
+    if not (token or access_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await get_current_user(token or access_token)
 
 @router.post("/signup")
 async def signup(user_data: UserCreate):
@@ -46,23 +70,32 @@ async def signup(user_data: UserCreate):
     
     # Create new user
     user_dict = user_data.dict()
-    user_dict["hashed_password"] = get_password_hash(user_dict.pop("password"))
+    user_dict["hashed_password"] = await hash_password(user_dict.pop("password"))
     user_dict["is_active"] = True
     
     result = await Database.get_collection("users").insert_one(user_dict)
     user_dict["id"] = str(result.inserted_id)
+    await bump_company_versions(user_data.company_code)
     
     return {"message": "User created successfully", "user": User(**convert_id(user_dict))}
 
 @router.post("/token")
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     user = await Database.get_collection("users").find_one({"email": form_data.username})
-    if not user or not verify_password(form_data.password, user["hashed_password"]):
+    verified, new_hash = (False, None)
+    if user:
+        verified, new_hash = await verify_and_update_password(form_data.password, user["hashed_password"])
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Transparently move the stored hash to the current cost factor
+        await Database.get_collection("users").update_one(
+            {"_id": user["_id"]}, {"$set": {"hashed_password": new_hash}}
+        )
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -1,19 +1,61 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
-from app.models.candidate import CandidateBase, CandidateCreate, CandidateResponse
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from app.models.candidate import (
+    CandidateBase,
+    CandidateCreate,
+    CandidateResponse,
+    CandidateSummary,
+    CandidatePage,
+    CandidateRankingPage,
+    CandidateSearchResult,
+    CandidateSearchPage,
+    CandidateBulkStatusUpdate,
+    CandidateBulkStatusResult
+)
 from app.database import Database
 from app.routes.auth import get_current_user
 from app.models.user import User
 from app.utils.mongo_utils import convert_id
-from typing import List
+from app.utils.pagination import fetch_page, KEYSET_SORT, encode_score_cursor, decode_score_cursor
+from app.utils.export import (
+    EXPORT_COLUMNS,
+    DEFAULT_EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    export_projection,
+    encode_csv,
+    encode_ndjson
+)
+from app.utils.serialization import trusted_list_response, trusted_page_response
+from app.utils.query_plan import summarize_explain
+from typing import List, Optional, Tuple
 from datetime import datetime
-import cloudinary
-import cloudinary.uploader
-import os
-import requests
+from functools import partial
+import asyncio
+import hashlib
+import io
+import json
+import uuid
+import zipfile
 from dotenv import load_dotenv
 import logging
 from bson.objectid import ObjectId
-from app.utils.ai_forward import send_cv_to_ai_server
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from app.utils.ai_forward import evaluate_cv
+from app.utils.progress import progress_broker
+from app.utils.deadline import Deadline
+from app.utils.rollups import record_candidate_changes
+from app.utils.storage import cv_storage, read_upload, read_limited
+from app.config import (
+    BULK_UPLOAD_CONCURRENCY,
+    MAX_UPLOAD_BYTES,
+    UPLOAD_DEADLINE_SECONDS,
+    CANDIDATE_PAGE_SIZE_DEFAULT,
+    CANDIDATE_PAGE_SIZE_MAX,
+    EXPORT_BATCH_SIZE,
+    DEBUG
+)
 
 # Load environment variables
 load_dotenv()
@@ -25,34 +67,38 @@ db = Database()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Cloudinary config with proper error handling
-cloud_name = os.getenv("CLOUDINARY_CLOUD_NAME")
-api_key = os.getenv("CLOUDINARY_API_KEY")
-api_secret = os.getenv("CLOUDINARY_API_SECRET")
+# File extensions accepted inside bulk archives, mapped to their MIME types
+CV_EXTENSION_TYPES = {
+    "pdf": "application/pdf",
+    "doc": "application/msword",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+ALLOWED_CV_TYPES = list(CV_EXTENSION_TYPES.values())
+ZIP_CONTENT_TYPES = ["application/zip", "application/x-zip-compressed"]
 
-if not all([cloud_name, api_key, api_secret]):
-    raise ValueError("Missing Cloudinary credentials. Please check your .env file.")
+# Bulk uploads that are still running in the background
+background_tasks = set()
 
-cloudinary.config(
-    cloud_name=cloud_name,
-    api_key=api_key,
-    api_secret=api_secret
-)
+# Candidate creations in progress, keyed by (job_role_id, content_hash)
+inflight_uploads = {}
+
+# Inserts tried when the conflicting candidate keeps disappearing before it can be read
+INSERT_ATTEMPTS = 3
+
+CANDIDATE_STATUSES = ["pending", "selected", "rejected", "shortlisted"]
+
+# List views leave out the long texts; they are served by GET /candidates/{id}
+SUMMARY_PROJECTION = {"feedback": 0, "detailed_feedback": 0, "content_hash": 0}
 
 # --- Helper: Call AI parser (deployed API) ---
-async def parse_cv_with_ai(cv_url: str, job_description: str) -> dict:
+async def parse_cv_with_ai(cv_content: bytes, job_description: str, deadline: Optional[Deadline] = None) -> dict:
     """Parse a CV using the deployed AI API."""
     try:
-        # Download the CV from Cloudinary
-        response = requests.get(cv_url)
-        if response.status_code != 200:
-            raise HTTPException(status_code=400, detail="Failed to download CV from Cloudinary")
-
         # Use the deployed AI API (with local fallback)
-        logger.info(f"Calling AI service with CV URL: {cv_url} and job description length: {len(job_description)}")
+        logger.info(f"Calling AI service with CV of {len(cv_content)} bytes and job description length: {len(job_description)}")
         
-        # Send CV file and job description to AI service
-        ai_result = send_cv_to_ai_server(response.content, job_description)
+        # Send CV file and job description to AI service off the event loop
+        ai_result = await evaluate_cv(cv_content, job_description, deadline)
         
         logger.info(f"AI service response: {ai_result}")
         
@@ -76,6 +122,271 @@ async def parse_cv_with_ai(cv_url: str, job_description: str) -> dict:
             detail=f"Failed to parse CV using AI service: {str(e)}"
         )
 
+async def store_cv_file(
+    file_content: bytes,
+    filename: str,
+    content_hash: str,
+    deadline: Optional[Deadline] = None
+) -> str:
+    """Save a CV with the configured storage backend and return its URL."""
+    if deadline and deadline.expired:
+        raise HTTPException(status_code=504, detail="Upload deadline exceeded before the file was stored")
+    try:
+        cv_url = await cv_storage.save(
+            file_content, filename, content_hash, timeout=deadline.remaining() if deadline else None
+        )
+        logging.info(f"File stored successfully ({cv_storage.name}): {cv_url}")
+        return cv_url
+    except Exception as e:
+        logging.error(f"CV storage ({cv_storage.name}) failed: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to upload file to storage: {str(e)}"
+        )
+
+async def analyze_candidate_cv(
+    file_content: bytes,
+    filename: str,
+    cv_url: str,
+    job_role: dict,
+    job_description: str,
+    current_user: User,
+    deadline: Optional[Deadline] = None
+) -> dict:
+    """Run the AI analysis for an uploaded CV and build the candidate document."""
+    base_doc = {
+        "cv_url": cv_url,
+        "recruiter_id": str(current_user.id),
+        "job_role_id": str(job_role["_id"]),
+        "job_role_title": job_role["title"],
+        "company_id": job_role.get("company_id"),
+    }
+    try:
+        ai_result = await parse_cv_with_ai(file_content, job_description, deadline)
+        logging.info(f"AI parsing result: {ai_result}")
+        
+        # Handle ineligible candidates
+        if ai_result.get("eligibility") == "not_eligible":
+            return {
+                "candidate_name": ai_result["candidate_name"],
+                "degree": "Not Eligible",
+                "course": "Not Eligible",
+                "cgpa": "N/A",
+                "ats_score": 0,
+                "strengths": [],
+                "weaknesses": [],
+                "feedback": f"Not eligible: {ai_result['reason']}",
+                "detailed_feedback": f"Not eligible: {ai_result['reason']}",
+                **base_doc,
+                "status": "rejected",
+                "created_at": datetime.utcnow(),
+            }
+        # Handle eligible candidates
+        return {
+            "candidate_name": ai_result["candidate_name"],
+            "degree": ai_result.get("degree", "Not specified"),
+            "course": ai_result.get("course", "Not specified"),
+            "cgpa": ai_result.get("cgpa", "Not specified"),
+            "ats_score": ai_result.get("ats_score", 0),
+            "strengths": ai_result.get("strengths", []),
+            "weaknesses": ai_result.get("weaknesses", []),
+            "feedback": ai_result.get("feedback", ""),
+            "detailed_feedback": ai_result.get("detailed_feedback", ""),
+            **base_doc,
+            **({"analysis_failed": True} if ai_result.get("analysis_failed") else {}),
+            "status": "pending",
+            "created_at": datetime.utcnow(),
+        }
+    except Exception as e:
+        logging.error(f"AI parsing failed: {str(e)}")
+        # If AI parsing fails, store with default values
+        return {
+            "candidate_name": filename.rsplit('/', 1)[-1].split('.')[0],  # Use filename without extension
+            "degree": "Pending AI Analysis",
+            "course": "Pending AI Analysis", 
+            "cgpa": "Pending AI Analysis",
+            "ats_score": 0,
+            "strengths": ["AI analysis pending"],
+            "weaknesses": ["AI analysis pending"],
+            "feedback": f"AI analysis failed: {str(e)}. Please try again or contact support.",
+            "detailed_feedback": f"The CV was uploaded successfully but AI analysis failed with error: {str(e)}. This could be due to missing API keys, network issues, or unsupported file format. Please ensure all AI services are properly configured.",
+            **base_doc,
+            "analysis_failed": True,
+            "status": "pending",
+            "created_at": datetime.utcnow(),
+        }
+
+def publish_progress(stage: str, upload_id: str, filename: str, job_role: dict, current_user: User, **details):
+    """Publish an analysis progress event for the uploading recruiter and their company."""
+    progress_broker.publish({
+        "stage": stage,
+        "upload_id": upload_id,
+        "filename": filename,
+        "job_role_id": str(job_role["_id"]),
+        "recruiter_id": str(current_user.id),
+        "company_id": job_role.get("company_id"),
+        **details
+    })
+
+async def get_job_role_or_404(job_role_id: str) -> dict:
+    if not ObjectId.is_valid(job_role_id):
+        raise HTTPException(status_code=400, detail="Invalid job role ID")
+    job_role = await db.get_collection("job_roles").find_one({"_id": ObjectId(job_role_id)})
+    if not job_role:
+        raise HTTPException(status_code=404, detail="Job role not found")
+    return job_role
+
+async def get_candidate_company_id(candidate: dict) -> Optional[str]:
+    """Company of a candidate; only documents written before company_id was stored need the job role."""
+    if candidate.get("company_id"):
+        return candidate["company_id"]
+    job_role_id = candidate.get("job_role_id")
+    if not job_role_id or not ObjectId.is_valid(job_role_id):
+        return None
+    job_role = await db.get_collection("job_roles").find_one({"_id": ObjectId(job_role_id)}, {"company_id": 1})
+    return job_role.get("company_id") if job_role else None
+
+async def get_candidate_company_ids(candidates: List[dict]) -> dict:
+    """Map candidate _id to company id, with one job role lookup for all legacy documents."""
+    company_ids = {c["_id"]: c.get("company_id") for c in candidates}
+    legacy = [c for c in candidates if not c.get("company_id") and ObjectId.is_valid(c.get("job_role_id") or "")]
+    if legacy:
+        job_roles = await db.get_collection("job_roles").find(
+            {"_id": {"$in": list({ObjectId(c["job_role_id"]) for c in legacy})}}, {"company_id": 1}
+        ).to_list(length=None)
+        role_companies = {str(jr["_id"]): jr.get("company_id") for jr in job_roles}
+        for c in legacy:
+            company_ids[c["_id"]] = role_companies.get(c["job_role_id"])
+    return company_ids
+
+def hash_cv_content(file_content: bytes) -> str:
+    return hashlib.sha256(file_content).hexdigest()
+
+def analysis_failed(candidate: dict) -> bool:
+    """Whether a stored candidate holds a placeholder from a failed AI analysis rather than a result."""
+    # Documents stored before analysis_failed existed are recognised by their placeholder values
+    return bool(
+        candidate.get("analysis_failed")
+        or candidate.get("degree") == "Pending AI Analysis"
+        or candidate.get("candidate_name") == "Analysis Failed"
+    )
+
+async def replace_failed_analysis(existing: dict, candidate_doc: dict) -> Optional[dict]:
+    """
+    Overwrite the analysis of a candidate whose earlier analysis failed,
+    keeping its id, recruiter and upload time. The status is only taken
+    from the new analysis if nobody has moved the candidate on yet.
+    Returns the updated document, or None if the candidate is gone.
+    """
+    fields = {k: v for k, v in candidate_doc.items() if k not in ("_id", "recruiter_id", "created_at", "status", "analysis_failed")}
+    query = {"_id": existing["_id"]}
+    if existing.get("status") == "pending":
+        fields["status"] = candidate_doc["status"]
+    update = {"$set": fields}
+    if candidate_doc.get("analysis_failed"):
+        fields["analysis_failed"] = True
+    else:
+        update["$unset"] = {"analysis_failed": ""}
+    before = await db.get_collection("candidates").find_one_and_update(
+        query, update, return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        return None
+    after = {k: v for k, v in {**before, **fields}.items() if k not in update.get("$unset", {})}
+    await record_candidate_changes([(before, after)])
+    return after
+
+async def create_candidate_from_cv(
+    file_content: bytes,
+    filename: str,
+    job_role: dict,
+    job_description: str,
+    current_user: User,
+    upload_id: str,
+    deadline: Optional[Deadline] = None,
+    content_hash: Optional[str] = None
+) -> Tuple[dict, bool]:
+    """
+    Store, analyze and insert a CV for a job role, returning (candidate_doc, created).
+    Uploads are idempotent on the CV content: a repeat returns the existing
+    candidate, or waits for the in-flight analysis of the same file. A
+    candidate whose analysis failed is not final: uploading the file again
+    re-runs the analysis and updates that candidate in place.
+    """
+    job_role_id = str(job_role["_id"])
+    content_hash = content_hash or hash_cv_content(file_content)
+    key = (job_role_id, content_hash)
+    collection = db.get_collection("candidates")
+
+    existing = None
+    inflight = inflight_uploads.get(key)
+    if inflight is None:
+        existing = await collection.find_one({"job_role_id": job_role_id, "content_hash": content_hash})
+        if existing and not analysis_failed(existing):
+            return existing, False
+        inflight = inflight_uploads.get(key)
+    if inflight is not None:
+        try:
+            candidate_doc = await asyncio.wait_for(
+                asyncio.shield(inflight), deadline.remaining() if deadline else None
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Upload deadline exceeded while waiting for the same CV to finish processing")
+        return dict(candidate_doc), False
+
+    inflight = asyncio.get_running_loop().create_future()
+    # Avoid "exception was never retrieved" warnings when nobody else waited
+    inflight.add_done_callback(lambda f: f.cancelled() or f.exception())
+    inflight_uploads[key] = inflight
+    try:
+        publish_progress("parsing", upload_id, filename, job_role, current_user)
+        cv_url = await store_cv_file(file_content, filename, content_hash, deadline)
+        publish_progress("evaluating", upload_id, filename, job_role, current_user)
+        candidate_doc = await analyze_candidate_cv(
+            file_content, filename, cv_url, job_role, job_description, current_user, deadline
+        )
+        candidate_doc["content_hash"] = content_hash
+
+        if existing:
+            retried = await replace_failed_analysis(existing, candidate_doc)
+            if retried is not None:
+                inflight.set_result(dict(retried))
+                return retried, False
+
+        # Store candidate in DB
+        for _ in range(INSERT_ATTEMPTS):
+            try:
+                insert_result = await collection.insert_one(candidate_doc)
+                candidate_doc["_id"] = insert_result.inserted_id
+                created = True
+                break
+            except DuplicateKeyError:
+                # Another worker stored the same CV for this role first
+                stored = await collection.find_one({"job_role_id": job_role_id, "content_hash": content_hash})
+                if stored is not None:
+                    candidate_doc = stored
+                    created = False
+                    break
+                # ...and it was deleted again before we could read it, so the insert may go through now
+            except Exception as e:
+                logging.error(f"Database operation failed: {str(e)}")
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to store candidate data: {str(e)}"
+                )
+        else:
+            raise HTTPException(status_code=409, detail="The same CV is being stored and deleted concurrently; try again")
+        inflight.set_result(dict(candidate_doc))
+        return candidate_doc, created
+    except asyncio.CancelledError:
+        inflight.cancel()
+        raise
+    except Exception as e:
+        inflight.set_exception(e)
+        raise
+    finally:
+        inflight_uploads.pop(key, None)
+
 @router.post("/candidates/upload", response_model=CandidateResponse)
 async def upload_candidate_cv(
     job_role_id: str = Form(...),
@@ -87,133 +398,44 @@ async def upload_candidate_cv(
         raise HTTPException(status_code=403, detail="Only recruiters can upload CVs.")
     
     # Validate file type
-    allowed_types = ["application/pdf", "application/msword", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
-    if file.content_type not in allowed_types:
+    if file.content_type not in ALLOWED_CV_TYPES:
         raise HTTPException(
             status_code=400,
             detail="Invalid file type. Only PDF, DOC, and DOCX files are allowed."
         )
     
-    # Upload file to Cloudinary
+    upload_id = uuid.uuid4().hex
+    deadline = Deadline(UPLOAD_DEADLINE_SECONDS)
+    job_role = None
     try:
-        # Read file content
-        file_content = await file.read()
-        if not file_content:
-            raise HTTPException(status_code=400, detail="Empty file uploaded")
-            
-        # Upload to Cloudinary with specific resource type
-        try:
-            result = cloudinary.uploader.upload(
-                file_content,
-                resource_type="raw",  # Use raw for all document types
-                folder="cv_uploads",
-                type="upload",
-                public_id=f"{file.filename.split('.')[0]}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-                format=file.filename.split('.')[-1].lower()  # Preserve original format
-            )
-            cv_url = result["secure_url"]
-            logging.info(f"File uploaded successfully to Cloudinary: {cv_url}")
-        except Exception as e:
-            logging.error(f"Cloudinary upload failed: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to upload file to storage: {str(e)}"
-            )
-        
         # Get job role title
-        job_role = await db.get_collection("job_roles").find_one({"_id": ObjectId(job_role_id)})
-        if not job_role:
-            raise HTTPException(status_code=404, detail="Job role not found")
+        job_role = await get_job_role_or_404(job_role_id)
+        publish_progress("queued", upload_id, file.filename, job_role, current_user)
         
-        # Parse CV with AI
-        try:
-            ai_result = await parse_cv_with_ai(cv_url, job_description)
-            logging.info(f"AI parsing result: {ai_result}")
-            
-            # Handle ineligible candidates
-            if ai_result.get("eligibility") == "not_eligible":
-                candidate_doc = {
-                    "candidate_name": ai_result["candidate_name"],
-                    "degree": "Not Eligible",
-                    "course": "Not Eligible",
-                    "cgpa": "N/A",
-                    "ats_score": 0,
-                    "strengths": [],
-                    "weaknesses": [],
-                    "feedback": f"Not eligible: {ai_result['reason']}",
-                    "detailed_feedback": f"Not eligible: {ai_result['reason']}",
-                    "cv_url": cv_url,
-                    "recruiter_id": str(current_user.id),
-                    "job_role_id": job_role_id,
-                    "job_role_title": job_role["title"],
-                    "status": "rejected",
-                    "created_at": datetime.utcnow(),
-                }
-            else:
-                # Handle eligible candidates
-                candidate_doc = {
-                    "candidate_name": ai_result["candidate_name"],
-                    "degree": ai_result.get("degree", "Not specified"),
-                    "course": ai_result.get("course", "Not specified"),
-                    "cgpa": ai_result.get("cgpa", "Not specified"),
-                    "ats_score": ai_result.get("ats_score", 0),
-                    "strengths": ai_result.get("strengths", []),
-                    "weaknesses": ai_result.get("weaknesses", []),
-                    "feedback": ai_result.get("feedback", ""),
-                    "detailed_feedback": ai_result.get("detailed_feedback", ""),
-                    "cv_url": cv_url,
-                    "recruiter_id": str(current_user.id),
-                    "job_role_id": job_role_id,
-                    "job_role_title": job_role["title"],
-                    "status": "pending",
-                    "created_at": datetime.utcnow(),
-                }
-        except Exception as e:
-            logging.error(f"AI parsing failed: {str(e)}")
-            # If AI parsing fails, store with default values
-            candidate_doc = {
-                "candidate_name": file.filename.split('.')[0],  # Use filename without extension
-                "degree": "Pending AI Analysis",
-                "course": "Pending AI Analysis", 
-                "cgpa": "Pending AI Analysis",
-                "ats_score": 0,
-                "strengths": ["AI analysis pending"],
-                "weaknesses": ["AI analysis pending"],
-                "feedback": f"AI analysis failed: {str(e)}. Please try again or contact support.",
-                "detailed_feedback": f"The CV was uploaded successfully but AI analysis failed with error: {str(e)}. This could be due to missing API keys, network issues, or unsupported file format. Please ensure all AI services are properly configured.",
-                "cv_url": cv_url,
-                "recruiter_id": str(current_user.id),
-                "job_role_id": job_role_id,
-                "job_role_title": job_role["title"],
-                "status": "pending",
-                "created_at": datetime.utcnow(),
-            }
+        # Read file content in chunks, enforcing MAX_UPLOAD_BYTES
+        file_content, content_hash = await read_upload(file)
+        if not file_content:
+            raise HTTPException(status_code=400, detail="Empty file uploaded")
         
-        # Store candidate in DB
-        try:
-            collection = db.get_collection("candidates")
-            insert_result = await collection.insert_one(candidate_doc)
-            await db.get_collection("job_roles").update_one(
-                {"_id": ObjectId(job_role_id)},
-                {"$inc": {"applications_count": 1}}
-            )
-
-            candidate_doc["_id"] = insert_result.inserted_id
-            
+        # Store the file, parse CV with AI and store the candidate
+        candidate_doc, created = await create_candidate_from_cv(
+            file_content, file.filename, job_role, job_description, current_user, upload_id, deadline, content_hash
+        )
+        if created:
+            await record_candidate_changes([(None, candidate_doc)])
             await increment_total_cvs_counter()
+        
+        publish_progress("done", upload_id, file.filename, job_role, current_user, candidate_id=str(candidate_doc["_id"]), duplicate=not created)
+        return CandidateResponse(**convert_id(candidate_doc))
             
-            return CandidateResponse(**convert_id(candidate_doc))
-        except Exception as e:
-            logging.error(f"Database operation failed: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to store candidate data: {str(e)}"
-            )
-            
-    except HTTPException:
+    except HTTPException as e:
+        if job_role:
+            publish_progress("failed", upload_id, file.filename, job_role, current_user, error=e.detail)
         raise
     except Exception as e:
         logging.error(f"CV upload failed: {str(e)}")
+        if job_role:
+            publish_progress("failed", upload_id, file.filename, job_role, current_user, error=str(e))
         raise HTTPException(
             status_code=500,
             detail=f"Failed to upload CV: {str(e)}"
@@ -221,6 +443,198 @@ async def upload_candidate_cv(
     finally:
         await file.close()
 
+def iter_bulk_entries(files: List[UploadFile]):
+    """
+    Yield (filename, content_type, read, error) for every CV in a bulk upload.
+    Zip archives are opened in place and each entry is only decompressed
+    when its `read` callable is invoked, so at most one entry per worker
+    is held in memory. `read` returns (content, sha256) and stops with 413
+    once an entry passes MAX_UPLOAD_BYTES, whatever size the archive declares.
+    """
+    for upload in files:
+        filename = upload.filename or "upload"
+        if upload.content_type in ZIP_CONTENT_TYPES or filename.lower().endswith(".zip"):
+            try:
+                archive = zipfile.ZipFile(upload.file)
+            except zipfile.BadZipFile as e:
+                yield filename, upload.content_type, None, f"Invalid zip archive: {str(e)}"
+                continue
+            for info in archive.infolist():
+                if info.is_dir() or info.filename.startswith("__MACOSX/"):
+                    continue
+                extension = info.filename.rsplit('.', 1)[-1].lower()
+                content_type = CV_EXTENSION_TYPES.get(extension)
+                if info.file_size > MAX_UPLOAD_BYTES:
+                    yield info.filename, content_type, None, "File too large"
+                    continue
+                yield info.filename, content_type, partial(read_zip_entry, archive, info), None
+        else:
+            yield filename, upload.content_type, partial(read_limited, upload.file), None
+
+def read_zip_entry(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> Tuple[bytes, str]:
+    with archive.open(info) as entry:
+        return read_limited(entry)
+
+async def process_bulk_entry(
+    index: int,
+    upload_id: str,
+    filename: str,
+    content_type: str,
+    file_content: bytes,
+    job_role: dict,
+    job_description: str,
+    current_user: User,
+    content_hash: Optional[str] = None
+) -> Tuple[dict, Optional[dict]]:
+    """Process a single CV from a bulk upload; return the outcome and the new candidate, if one was created."""
+    outcome = {"index": index, "upload_id": upload_id, "filename": filename}
+    created_doc = None
+    try:
+        if content_type not in ALLOWED_CV_TYPES:
+            raise HTTPException(status_code=400, detail="Invalid file type. Only PDF, DOC, and DOCX files are allowed.")
+        if not file_content:
+            raise HTTPException(status_code=400, detail="Empty file uploaded")
+        candidate_doc, created = await create_candidate_from_cv(
+            file_content, filename, job_role, job_description, current_user, upload_id,
+            Deadline(UPLOAD_DEADLINE_SECONDS), content_hash
+        )
+        if created:
+            created_doc = dict(candidate_doc)
+        candidate = CandidateResponse(**convert_id(candidate_doc))
+        outcome.update({
+            "status": "created" if created else "duplicate",
+            "candidate": candidate.model_dump(mode="json")
+        })
+        publish_progress("done", upload_id, filename, job_role, current_user, candidate_id=candidate.id, duplicate=not created)
+    except HTTPException as e:
+        outcome.update({"status": "failed", "error": e.detail})
+    except Exception as e:
+        logging.error(f"Bulk upload of {filename} failed: {str(e)}")
+        outcome.update({"status": "failed", "error": str(e)})
+    if outcome["status"] == "failed":
+        publish_progress("failed", upload_id, filename, job_role, current_user, error=outcome["error"])
+    return outcome, created_doc
+
+def take_upload_files(files: List[UploadFile]) -> List[UploadFile]:
+    """
+    Move the spooled files out of the request's UploadFiles, which FastAPI
+    closes once the response returns (or the client disconnects), so the
+    background producer can keep reading them. The caller must close them.
+    """
+    owned = []
+    for upload in files:
+        owned.append(UploadFile(file=upload.file, size=upload.size, filename=upload.filename, headers=upload.headers))
+        upload.file = io.BytesIO()
+    return owned
+
+async def bulk_upload_stream(
+    files: List[UploadFile],
+    job_role: dict,
+    job_description: str,
+    current_user: User,
+    concurrency: int = BULK_UPLOAD_CONCURRENCY
+):
+    """Process bulk upload entries concurrently and yield NDJSON outcome lines."""
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes = asyncio.Queue()
+    summary = {"total": 0, "created": 0, "duplicate": 0, "failed": 0}
+    created_docs = []
+
+    async def report(outcome):
+        summary[outcome["status"]] += 1
+        await outcomes.put(outcome)
+
+    async def run_entry(index, upload_id, filename, content_type, file_content, content_hash):
+        try:
+            outcome, created_doc = await process_bulk_entry(
+                index, upload_id, filename, content_type, file_content, job_role, job_description, current_user,
+                content_hash
+            )
+        finally:
+            semaphore.release()
+        if created_doc:
+            created_docs.append(created_doc)
+        await report(outcome)
+
+    async def produce():
+        tasks = []
+        try:
+            for index, (filename, content_type, read, error) in enumerate(iter_bulk_entries(files)):
+                summary["total"] += 1
+                upload_id = uuid.uuid4().hex
+                if error:
+                    publish_progress("failed", upload_id, filename, job_role, current_user, error=error)
+                    await report({"index": index, "upload_id": upload_id, "filename": filename, "status": "failed", "error": error})
+                    continue
+                publish_progress("queued", upload_id, filename, job_role, current_user)
+                # Only read the next entry once a worker slot is free
+                await semaphore.acquire()
+                try:
+                    file_content, content_hash = await run_in_threadpool(read)
+                except Exception as e:
+                    semaphore.release()
+                    error = e.detail if isinstance(e, HTTPException) else str(e)
+                    publish_progress("failed", upload_id, filename, job_role, current_user, error=error)
+                    await report({"index": index, "upload_id": upload_id, "filename": filename, "status": "failed", "error": error})
+                    continue
+                tasks.append(asyncio.create_task(
+                    run_entry(index, upload_id, filename, content_type, file_content, content_hash)
+                ))
+        finally:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Batch counters are updated once for the whole upload, even if the client went away
+            if created_docs:
+                await record_candidate_changes([(None, doc) for doc in created_docs])
+                await increment_total_cvs_counter(len(created_docs))
+            await outcomes.put(None)
+            for upload in files:
+                await upload.close()
+
+    producer = asyncio.create_task(produce())
+    # Keep a strong reference so processing finishes even if the client disconnects
+    background_tasks.add(producer)
+    producer.add_done_callback(background_tasks.discard)
+    while True:
+        outcome = await outcomes.get()
+        if outcome is None:
+            break
+        yield json.dumps(outcome) + "\n"
+    await producer
+    yield json.dumps({"summary": summary}) + "\n"
+
+@router.post("/candidates/upload/bulk")
+async def bulk_upload_candidate_cvs(
+    job_role_id: str = Form(...),
+    job_description: str = Form(...),
+    files: List[UploadFile] = File(...),
+    current_user: User = Depends(get_current_user)
+):
+    """Upload many CVs (or zip archives of CVs) for one job role, streaming per-file results as NDJSON."""
+    if current_user.role != "recruiter":
+        raise HTTPException(status_code=403, detail="Only recruiters can upload CVs.")
+    job_role = await get_job_role_or_404(job_role_id)
+    return StreamingResponse(
+        bulk_upload_stream(take_upload_files(files), job_role, job_description, current_user),
+        media_type="application/x-ndjson"
+    )
+
+async def fill_missing_job_role_titles(candidates: List[dict]) -> List[dict]:
+    """Set job_role_title on legacy candidates that lack it, using one batched job role lookup."""
+    missing_ids = {
+        c.get("job_role_id") for c in candidates
+        if "job_role_title" not in c and ObjectId.is_valid(c.get("job_role_id") or "")
+    }
+    titles = {}
+    if missing_ids:
+        job_roles = await db.get_collection("job_roles").find(
+            {"_id": {"$in": [ObjectId(i) for i in missing_ids]}}, {"title": 1}
+        ).to_list(length=None)
+        titles = {str(jr["_id"]): jr["title"] for jr in job_roles}
+    for candidate in candidates:
+        if "job_role_title" not in candidate:
+            candidate["job_role_title"] = titles.get(candidate.get("job_role_id"), "Unknown Role")
+    return candidates
+
 @router.get("/recruiter", response_model=List[CandidateResponse])
 async def get_recruiter_candidates(current_user: User = Depends(get_current_user)):
     try:
@@ -230,22 +644,10 @@ async def get_recruiter_candidates(current_user: User = Depends(get_current_user
         collection = db.get_collection("candidates")
         candidates = await collection.find({"recruiter_id": str(current_user.id)}).to_list(length=None)
         
-        # Convert ObjectIds to strings and ensure all required fields are present
-        processed_candidates = []
-        for candidate in candidates:
-            candidate_data = convert_id(candidate)
-            # Ensure all required fields are present
-            if "job_role_title" not in candidate_data:
-                # Fetch job role title if missing
-                job_role = await db.get_collection("job_roles").find_one({"_id": ObjectId(candidate_data["job_role_id"])})
-                if job_role:
-                    candidate_data["job_role_title"] = job_role["title"]
-                else:
-                    candidate_data["job_role_title"] = "Unknown Role"
-            
-            processed_candidates.append(candidate_data)
+        # Ensure all required fields are present
+        await fill_missing_job_role_titles(candidates)
         
-        return [CandidateResponse(**c) for c in processed_candidates]
+        return trusted_list_response(candidates, CandidateResponse)
     except Exception as e:
         logging.error(f"Error fetching recruiter candidates: {str(e)}")
         raise HTTPException(
@@ -259,17 +661,219 @@ async def get_company_candidates(current_user: User = Depends(get_current_user))
         # Admin: return all CVs
         collection = db.get_collection("candidates")
         candidates = await collection.find({}).to_list(length=None)
-        return [CandidateResponse(**convert_id(c)) for c in candidates]
+        return trusted_list_response(candidates, CandidateResponse)
     elif current_user.role == "hiring_manager":
         # Hiring manager: return CVs for their company
-        job_roles = await db.get_collection("job_roles").find({"company_id": current_user.company_code}).to_list(length=None)
-        job_role_ids = [str(jr["_id"]) for jr in job_roles]
         collection = db.get_collection("candidates")
-        candidates = await collection.find({"job_role_id": {"$in": job_role_ids}}).to_list(length=None)
-        return [CandidateResponse(**convert_id(c)) for c in candidates]
+        candidates = await collection.find({"company_id": current_user.company_code}).to_list(length=None)
+        return trusted_list_response(candidates, CandidateResponse)
     else:
         raise HTTPException(status_code=403, detail="Only admins or hiring managers can view all candidates.")
 
+@router.get("/recruiter/page", response_model=CandidatePage)
+async def get_recruiter_candidates_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(CANDIDATE_PAGE_SIZE_DEFAULT, ge=1, le=CANDIDATE_PAGE_SIZE_MAX),
+    current_user: User = Depends(get_current_user)
+):
+    """One page of the recruiter's candidates, newest first, without feedback texts."""
+    if current_user.role != "recruiter":
+        raise HTTPException(status_code=403, detail="Only recruiters can view their candidates.")
+    candidates, next_cursor = await fetch_page(
+        db.get_collection("candidates"),
+        {"recruiter_id": str(current_user.id)},
+        cursor,
+        limit,
+        SUMMARY_PROJECTION
+    )
+    await fill_missing_job_role_titles(candidates)
+    return trusted_page_response(candidates, CandidateSummary, next_cursor)
+
+@router.get("/candidates/company/page", response_model=CandidatePage)
+async def get_company_candidates_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(CANDIDATE_PAGE_SIZE_DEFAULT, ge=1, le=CANDIDATE_PAGE_SIZE_MAX),
+    current_user: User = Depends(get_current_user)
+):
+    """One page of all (admin) or company (hiring manager) candidates, newest first, without feedback texts."""
+    if current_user.role == "admin":
+        query = {}
+    elif current_user.role == "hiring_manager":
+        query = {"company_id": current_user.company_code}
+    else:
+        raise HTTPException(status_code=403, detail="Only admins or hiring managers can view all candidates.")
+    candidates, next_cursor = await fetch_page(
+        db.get_collection("candidates"), query, cursor, limit, SUMMARY_PROJECTION
+    )
+    await fill_missing_job_role_titles(candidates)
+    return trusted_page_response(candidates, CandidateSummary, next_cursor)
+
+def candidate_scope_filter(current_user: User) -> dict:
+    """Candidates the user may read: their own (recruiter), their company's (hiring manager) or all (admin)."""
+    if current_user.role == "recruiter":
+        return {"recruiter_id": str(current_user.id)}
+    if current_user.role == "hiring_manager":
+        return {"company_id": current_user.company_code}
+    if current_user.role == "admin":
+        return {}
+    raise HTTPException(status_code=403, detail="You don't have permission to view candidates")
+
+def build_candidate_filters(
+    job_role_id: Optional[str] = None,
+    status: Optional[str] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    degree: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> dict:
+    """Translate optional candidate query parameters into a MongoDB filter."""
+    query = {}
+    if job_role_id:
+        query["job_role_id"] = job_role_id
+    if status:
+        if status not in CANDIDATE_STATUSES:
+            raise HTTPException(status_code=400, detail="Invalid status value")
+        query["status"] = status
+    if min_score is not None or max_score is not None:
+        query["ats_score"] = {}
+        if min_score is not None:
+            query["ats_score"]["$gte"] = min_score
+        if max_score is not None:
+            query["ats_score"]["$lte"] = max_score
+    if degree:
+        query["degree"] = degree
+    if created_from or created_to:
+        query["created_at"] = {}
+        if created_from:
+            query["created_at"]["$gte"] = created_from
+        if created_to:
+            query["created_at"]["$lte"] = created_to
+    return query
+
+async def iter_candidate_batches(query: dict, projection: dict, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yield lists of candidates from one server-side cursor, newest first."""
+    cursor = db.get_collection("candidates").find(query, projection).sort(KEYSET_SORT).batch_size(batch_size)
+    try:
+        while True:
+            batch = await cursor.to_list(length=batch_size)
+            if not batch:
+                break
+            yield batch
+    finally:
+        await cursor.close()
+
+RANKING_SORT = [("ats_score", -1), ("_id", -1)]
+
+@router.get("/candidates/ranking", response_model=CandidateRankingPage)
+async def rank_candidates(
+    job_role_id: str,
+    status: Optional[str] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    max_score: Optional[int] = Query(None, ge=0, le=100),
+    degree: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=CANDIDATE_PAGE_SIZE_MAX),
+    explain: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Top candidates for a job role by ATS score, highest first, with optional
+    filters. Served from the (job_role_id[, status], ats_score, _id) indexes,
+    so a page reads about `limit` index entries. With DEBUG enabled,
+    `explain=true` adds a summary of the query plan to the response.
+    """
+    query = {
+        **build_candidate_filters(job_role_id, status, min_score, max_score, degree, created_from, created_to),
+        **candidate_scope_filter(current_user)
+    }
+    if cursor:
+        score, object_id = decode_score_cursor(cursor)
+        query = {"$and": [query, {"$or": [
+            {"ats_score": {"$lt": score}},
+            {"ats_score": score, "_id": {"$lt": object_id}},
+        ]}]}
+    find = db.get_collection("candidates").find(query, SUMMARY_PROJECTION).sort(RANKING_SORT).limit(limit + 1)
+    candidates = await find.to_list(length=limit + 1)
+    next_cursor = None
+    if len(candidates) > limit:
+        next_cursor = encode_score_cursor(candidates[limit - 1]["ats_score"], candidates[limit - 1]["_id"])
+        candidates = candidates[:limit]
+    await fill_missing_job_role_titles(candidates)
+    extra = {}
+    if explain and DEBUG:
+        plan = await db.get_collection("candidates").find(query, SUMMARY_PROJECTION).sort(RANKING_SORT).limit(limit + 1).explain()
+        extra["explain"] = summarize_explain(plan)
+    return trusted_page_response(candidates, CandidateSummary, next_cursor, **extra)
+
+@router.get("/candidates/export")
+async def export_candidates(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    columns: Optional[str] = Query(None, description="Comma separated column names"),
+    job_role_id: Optional[str] = None,
+    status: Optional[str] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    degree: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the candidates visible to the user as CSV or NDJSON, optionally filtered and with selected columns."""
+    selected = [c.strip() for c in columns.split(",") if c.strip()] if columns else DEFAULT_EXPORT_COLUMNS
+    unknown = [c for c in selected if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown export columns: {', '.join(unknown)}")
+    query = {
+        **build_candidate_filters(job_role_id, status, min_score, max_score, degree, created_from, created_to),
+        **candidate_scope_filter(current_user),
+    }
+    batches = iter_candidate_batches(query, export_projection(selected))
+    encode = encode_csv if format == "csv" else encode_ndjson
+    filename = f"candidates-{job_role_id or 'all'}-{datetime.utcnow():%Y%m%d}.{format}"
+    return StreamingResponse(
+        encode(batches, selected),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/candidates/search", response_model=CandidateSearchPage)
+async def search_candidates(
+    q: str = Query(..., min_length=1, max_length=200),
+    job_role_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(CANDIDATE_PAGE_SIZE_DEFAULT, ge=1, le=CANDIDATE_PAGE_SIZE_MAX),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Full-text search over strengths, weaknesses, feedback, degree and course
+    of the candidates visible to the user, most relevant first.
+    """
+    match = {"$text": {"$search": q}, **candidate_scope_filter(current_user)}
+    if job_role_id:
+        match["job_role_id"] = job_role_id
+    pipeline = [
+        {"$match": match},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+        {"$project": SUMMARY_PROJECTION},
+    ]
+    if cursor:
+        score, object_id = decode_score_cursor(cursor)
+        pipeline.append({"$match": {"$or": [
+            {"score": {"$lt": score}},
+            {"score": score, "_id": {"$lt": object_id}},
+        ]}})
+    pipeline += [{"$sort": {"score": -1, "_id": -1}}, {"$limit": limit + 1}]
+    candidates = await db.get_collection("candidates").aggregate(pipeline).to_list(length=limit + 1)
+    next_cursor = None
+    if len(candidates) > limit:
+        next_cursor = encode_score_cursor(candidates[limit - 1]["score"], candidates[limit - 1]["_id"])
+        candidates = candidates[:limit]
+    await fill_missing_job_role_titles(candidates)
+    return trusted_page_response(candidates, CandidateSearchResult, next_cursor)
+
 @router.get("/candidates/{candidate_id}", response_model=CandidateResponse)
 async def get_candidate(candidate_id: str, current_user: User = Depends(get_current_user)):
     try:
@@ -289,6 +893,88 @@ async def get_candidate(candidate_id: str, current_user: User = Depends(get_curr
     
     return CandidateResponse(**convert_id(candidate))
 
+def status_timestamp() -> datetime:
+    """Current time truncated to the millisecond precision MongoDB stores, so it can be matched exactly."""
+    now = datetime.utcnow()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+def status_update_filter(current_user: User) -> dict:
+    """Candidates the user may change the status of, as a query filter."""
+    # Recruiter: can only update their own candidates
+    if current_user.role == "recruiter":
+        return {"recruiter_id": str(current_user.id)}
+    # Hiring manager: can update any candidate for their company
+    if current_user.role == "hiring_manager":
+        return {"company_id": current_user.company_code}
+    raise HTTPException(status_code=403, detail="Only recruiters or hiring managers can update candidate status")
+
+@router.patch("/candidates/bulk-status", response_model=CandidateBulkStatusResult)
+async def bulk_update_candidate_status(
+    update: CandidateBulkStatusUpdate,
+    current_user: User = Depends(get_current_user)
+):
+    """Move many candidates to one status with one read, one bulk write and one counter update."""
+    if update.status not in CANDIDATE_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status value")
+    # Rejects roles that may not change statuses at all
+    status_update_filter(current_user)
+    result = CandidateBulkStatusResult(status=update.status)
+    object_ids = []
+    for candidate_id in dict.fromkeys(update.candidate_ids):
+        if ObjectId.is_valid(candidate_id):
+            object_ids.append(ObjectId(candidate_id))
+        else:
+            result.not_found.append(candidate_id)
+
+    collection = db.get_collection("candidates")
+    candidates = await collection.find(
+        {"_id": {"$in": object_ids}},
+        {"recruiter_id": 1, "job_role_id": 1, "company_id": 1, "status": 1, "ats_score": 1}
+    ).to_list(length=None)
+    found = {c["_id"] for c in candidates}
+    result.not_found.extend(str(i) for i in object_ids if i not in found)
+    if current_user.role == "hiring_manager":
+        company_ids = await get_candidate_company_ids(candidates)
+
+    transitions = {}
+    for candidate in candidates:
+        candidate_id = str(candidate["_id"])
+        if current_user.role == "recruiter":
+            allowed = candidate.get("recruiter_id") == str(current_user.id)
+        else:
+            allowed = company_ids.get(candidate["_id"]) == current_user.company_code
+        if not allowed:
+            result.forbidden.append(candidate_id)
+        elif candidate.get("status") == update.status:
+            result.unchanged.append(candidate_id)
+        else:
+            transitions[candidate["_id"]] = candidate
+
+    if transitions:
+        # Each update only applies from the status we read. The stamp (millisecond precision, like
+        # BSON dates) identifies this request's writes if some of them did not apply
+        stamp = status_timestamp()
+        write = await collection.bulk_write([
+            UpdateOne(
+                {"_id": candidate_id, "status": candidate.get("status")},
+                {"$set": {"status": update.status, "status_updated_at": stamp}}
+            )
+            for candidate_id, candidate in transitions.items()
+        ], ordered=False)
+        applied = set(transitions)
+        if write.modified_count < len(transitions):
+            # Some candidates changed after we read them; keep only the ones this request moved
+            current = await collection.find(
+                {"_id": {"$in": list(transitions)}, "status": update.status, "status_updated_at": stamp}, {"_id": 1}
+            ).to_list(length=None)
+            applied = {d["_id"] for d in current}
+        await record_candidate_changes([
+            (transitions[i], {**transitions[i], "status": update.status}) for i in applied
+        ])
+        result.updated.extend(str(i) for i in transitions if i in applied)
+        result.conflicted.extend(str(i) for i in transitions if i not in applied)
+    return result
+
 @router.patch("/{candidate_id}/status", response_model=CandidateResponse)
 async def update_candidate_status(
     candidate_id: str, 
@@ -301,10 +987,22 @@ async def update_candidate_status(
         raise HTTPException(status_code=400, detail="Invalid candidate ID")
     
     new_status = status_update.get("status")
-    if new_status not in ["pending", "selected", "rejected", "shortlisted"]:
+    if new_status not in CANDIDATE_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status value")
     
     collection = db.get_collection("candidates")
+    # Common case: check permission, apply the change and get the previous document in one round trip
+    candidate = await collection.find_one_and_update(
+        {"_id": object_id, **status_update_filter(current_user), "status": {"$ne": new_status}},
+        {"$set": {"status": new_status, "status_updated_at": status_timestamp()}},
+        return_document=ReturnDocument.BEFORE
+    )
+    if candidate:
+        updated_candidate = {**candidate, "status": new_status}
+        await record_candidate_changes([(candidate, updated_candidate)])
+        return CandidateResponse(**convert_id(updated_candidate))
+    
+    # Nothing matched: find out why (missing, not permitted, unchanged, or a legacy document without company_id)
     candidate = await collection.find_one({"_id": object_id})
     
     if not candidate:
@@ -315,29 +1013,23 @@ async def update_candidate_status(
         if str(candidate["recruiter_id"]) != str(current_user.id):
             raise HTTPException(status_code=403, detail="You don't have permission to update this candidate")
     # Hiring manager: can update any candidate for their company
-    elif current_user.role == "hiring_manager":
-        # Get job role to check company
-        job_role = await db.get_collection("job_roles").find_one({"_id": ObjectId(candidate["job_role_id"])})
-        if not job_role or job_role.get("company_id") != current_user.company_code:
-            raise HTTPException(status_code=403, detail="You don't have permission to update this candidate")
-    else:
-        raise HTTPException(status_code=403, detail="Only recruiters or hiring managers can update candidate status")
+    elif await get_candidate_company_id(candidate) != current_user.company_code:
+        raise HTTPException(status_code=403, detail="You don't have permission to update this candidate")
+    
+    if candidate.get("status") == new_status:
+        return CandidateResponse(**convert_id(candidate))
     
-    # Update the status
+    # Only move from the status we read, so each transition is counted exactly once
     result = await collection.update_one(
-        {"_id": object_id},
-        {"$set": {"status": new_status}}
+        {"_id": object_id, "status": candidate.get("status")},
+        {"$set": {"status": new_status, "status_updated_at": status_timestamp()}}
     )
     
     if result.modified_count == 0:
-        raise HTTPException(status_code=500, detail="Failed to update candidate status")
+        raise HTTPException(status_code=409, detail="Candidate status was changed concurrently, please retry")
     
-    # Return updated candidate
-    updated_candidate = await collection.find_one({"_id": object_id})
-    if new_status == "shortlisted": await db.get_collection("job_roles").update_one(
-        {"_id": ObjectId(candidate["job_role_id"])},
-        {"$inc": {"shortlisted_count": 1}}
-    )
+    updated_candidate = {**candidate, "status": new_status}
+    await record_candidate_changes([(candidate, updated_candidate)])
 
     return CandidateResponse(**convert_id(updated_candidate))
 
@@ -361,9 +1053,7 @@ async def delete_candidate(candidate_id: str, current_user: User = Depends(get_c
             raise HTTPException(status_code=403, detail="You don't have permission to delete this candidate")
     # Hiring manager: can delete any candidate for their company
     elif current_user.role == "hiring_manager":
-        # Get job role to check company
-        job_role = await db.get_collection("job_roles").find_one({"_id": ObjectId(candidate["job_role_id"])})
-        if not job_role or job_role.get("company_id") != current_user.company_code:
+        if await get_candidate_company_id(candidate) != current_user.company_code:
             raise HTTPException(status_code=403, detail="You don't have permission to delete this candidate")
     else:
         raise HTTPException(status_code=403, detail="Only recruiters or hiring managers can delete candidates")
@@ -374,13 +1064,15 @@ async def delete_candidate(candidate_id: str, current_user: User = Depends(get_c
     if result.deleted_count == 0:
         raise HTTPException(status_code=500, detail="Failed to delete candidate")
     
+    await record_candidate_changes([(candidate, None)])
+    
     return {"message": "Candidate deleted successfully"}
 
-async def increment_total_cvs_counter():
+async def increment_total_cvs_counter(count: int = 1):
     stats_collection = db.get_collection("stats")
     await stats_collection.update_one(
         {"_id": "total_cvs_processed"},
-        {"$inc": {"count": 1}},
+        {"$inc": {"count": count}},
         upsert=True
     ) 
 
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, UploadFile, File, Form
-from app.utils.ai_forward import send_cv_to_ai_server
+from app.utils.ai_forward import evaluate_cv
+from app.utils.deadline import Deadline
+from app.config import UPLOAD_DEADLINE_SECONDS
 
 router = APIRouter()
 
 @router.post("/evaluate/")
 async def evaluate(cv: UploadFile = File(...), jd: str = Form(...)):
-    result = send_cv_to_ai_server(cv.file, jd)
+    result = await evaluate_cv(await cv.read(), jd, Deadline(UPLOAD_DEADLINE_SECONDS))
     return result
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+import json
+
+from app.routes.auth import get_current_user_from_header_or_query
+from app.models.user import User
+from app.utils.progress import progress_broker
+from app.config import SSE_KEEPALIVE_SECONDS
+
+router = APIRouter()
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+
+@router.get("/candidates")
+async def candidate_progress_events(
+    request: Request,
+    current_user: User = Depends(get_current_user_from_header_or_query)
+):
+    """Server-sent events with per-candidate analysis progress for the caller's recruiter or company scope."""
+    if current_user.role == "recruiter":
+        subscription = progress_broker.subscribe("recruiter", str(current_user.id))
+    elif current_user.role == "hiring_manager":
+        if not current_user.company_code:
+            raise HTTPException(status_code=403, detail="Hiring manager is not linked to a company")
+        subscription = progress_broker.subscribe("company", current_user.company_code)
+    elif current_user.role == "admin":
+        subscription = progress_broker.subscribe("all")
+    else:
+        raise HTTPException(status_code=403, detail="Not allowed to follow candidate progress")
+
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.next_event(SSE_KEEPALIVE_SECONDS)
+                if subscription.dropped:
+                    # Tell the client it missed events so it can refetch the list once
+                    yield f"event: overflow\ndata: {json.dumps({'dropped': subscription.dropped})}\n\n"
+                    subscription.dropped = 0
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            progress_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
 import logging
@@ -10,6 +10,10 @@ from app.database import Database
 from app.routes.auth import get_current_user
 from app.models.user import User
 from app.utils.mongo_utils import convert_id
+from app.utils.candidate_metrics import compute_candidate_metrics
+from app.utils.rollups import get_rollup, summarize_rollup
+from app.utils.response_cache import cached_response, bump_company_versions
+from app.utils.cascade import create_cascade_job, cascade_runner
 
 router = APIRouter()
 db = Database()
@@ -45,6 +49,7 @@ async def create_job_role(job_role: JobRoleCreate, current_user: User = Depends(
         
         created_job_role = await collection.find_one({"_id": result.inserted_id})
         logging.info(f"Retrieved created job role: {created_job_role}")
+        await bump_company_versions(current_user.company_code)
         
         return JobRoleResponse(**convert_id(created_job_role))
     except DuplicateKeyError:
@@ -54,7 +59,12 @@ async def create_job_role(job_role: JobRoleCreate, current_user: User = Depends(
         )
 
 @router.get("/", response_model=List[JobRoleResponse])
-async def get_job_roles(current_user: User = Depends(get_current_user)):
+async def get_job_roles(request: Request, current_user: User = Depends(get_current_user)):
+    return await cached_response(
+        request, current_user.company_code, "job_roles", lambda: list_job_roles(current_user)
+    )
+
+async def list_job_roles(current_user: User) -> List[JobRoleResponse]:
     logging.info(f"Fetching job roles for company: {current_user.company_code}")
     query = {"company_id": current_user.company_code}
     collection = db.get_collection("job_roles")
@@ -73,7 +83,12 @@ async def get_job_roles(current_user: User = Depends(get_current_user)):
     return [JobRoleResponse(**convert_id(job_role)) for job_role in job_roles]
 
 @router.get("/top/", response_model=List[JobRoleResponse])
-async def get_top_job_roles(current_user: User = Depends(get_current_user)):
+async def get_top_job_roles(request: Request, current_user: User = Depends(get_current_user)):
+    return await cached_response(
+        request, current_user.company_code, "job_roles_top", lambda: list_top_job_roles(current_user)
+    )
+
+async def list_top_job_roles(current_user: User) -> List[JobRoleResponse]:
     logging.info(f"Fetching top job roles for company: {current_user.company_code}")
     query = {"company_id": current_user.company_code}
     collection = db.get_collection("job_roles")
@@ -117,8 +132,12 @@ async def get_job_role(job_id: str, current_user: User = Depends(get_current_use
     
     return JobRoleResponse(**convert_id(job_role))
 
-@router.delete("/{job_id}")
-async def delete_job_role(job_id: str, current_user: User = Depends(get_current_user)):
+@router.delete("/{job_id}", status_code=202)
+async def delete_job_role(job_id: str, archive: bool = False, current_user: User = Depends(get_current_user)):
+    """
+    Delete a job role and queue the removal (or archiving) of its candidates
+    in the background; poll /jobs/{job_id} for progress.
+    """
     if current_user.role != "hiring_manager":
         raise HTTPException(status_code=403, detail="Only hiring managers can delete job roles")
     try:
@@ -133,8 +152,11 @@ async def delete_job_role(job_id: str, current_user: User = Depends(get_current_
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Job role not found")
+    await bump_company_versions(current_user.company_code)
+    cleanup_job_id = await create_cascade_job(job_id, current_user.company_code, archive, str(current_user.id))
+    cascade_runner.submit(cleanup_job_id)
     
-    return {"message": "Job role deleted successfully"}
+    return {"message": "Job role deleted successfully", "job_id": cleanup_job_id}
 
 @router.put("/{job_id}", response_model=JobRoleResponse)
 async def update_job_role(
@@ -169,16 +191,44 @@ async def update_job_role(
     
     if not result:
         raise HTTPException(status_code=404, detail="Job role not found")
+    await bump_company_versions(current_user.company_code)
     
     return JobRoleResponse(**convert_id(result))
 
+async def load_candidate_metrics(scope: str, key: str, match: dict, titles: Optional[dict] = None) -> dict:
+    """Read dashboard numbers from the maintained rollup, aggregating candidates only if it doesn't exist yet."""
+    rollup = await get_rollup(scope, key)
+    if rollup is None:
+        return await compute_candidate_metrics(db.get_collection("candidates"), match)
+    metrics = summarize_rollup(rollup)
+    if titles is not None:
+        metrics["roles"] = {role_id: counts for role_id, counts in metrics["roles"].items() if role_id in titles}
+    metrics["most_applied_role"] = None
+    if metrics["roles"]:
+        role_id = max(metrics["roles"], key=lambda r: metrics["roles"][r]["total"])
+        if titles is None:
+            job_role = None
+            if ObjectId.is_valid(role_id):
+                job_role = await db.get_collection("job_roles").find_one({"_id": ObjectId(role_id)}, {"title": 1})
+            titles = {role_id: job_role.get("title", "Unknown") if job_role else "Unknown"}
+        metrics["most_applied_role"] = titles[role_id]
+    return metrics
+
 @router.get("/metrics/")
-async def get_metrics(current_user: User = Depends(get_current_user)):
+async def get_metrics(request: Request, current_user: User = Depends(get_current_user)):
+    # Recruiters see their own numbers, hiring managers the company's
+    scope = f"metrics:{current_user.role}:{current_user.id if current_user.role == 'recruiter' else ''}"
+    return await cached_response(
+        request, current_user.company_code, scope, lambda: compute_metrics(current_user)
+    )
+
+async def compute_metrics(current_user: User) -> dict:
     if current_user.role == "recruiter":
-        # Recruiter metrics (existing logic)
-        collection = db.get_collection("candidates")
-        candidates = await collection.find({"recruiter_id": str(current_user.id)}).to_list(length=None)
-        if not candidates:
+        # Recruiter metrics
+        metrics = await load_candidate_metrics(
+            "recruiter", str(current_user.id), {"recruiter_id": str(current_user.id)}
+        )
+        if not metrics["total"]:
             return {
                 "mostAppliedRole": "No applications yet",
                 "avgFitScore": 0,
@@ -186,34 +236,28 @@ async def get_metrics(current_user: User = Depends(get_current_user)):
                 "rejected": 0,
                 "shortlisted": 0
             }
-        total_cvs = len(candidates)
-        role_counts = {}
-        for candidate in candidates:
-            role = candidate.get("job_role_title", "Unknown")
-            role_counts[role] = role_counts.get(role, 0) + 1
-        most_applied_role = max(role_counts.items(), key=lambda x: x[1])[0] if role_counts else "No applications"
-        valid_scores = [c.get("ats_score", 0) for c in candidates if c.get("ats_score") is not None]
-        avg_fit_score = round(sum(valid_scores) / len(valid_scores), 1) if valid_scores else 0
-        rejected_count = len([c for c in candidates if c.get("status") == "rejected"])
-        shortlisted_count = len([c for c in candidates if c.get("status") == "shortlisted"])
         return {
-            "mostAppliedRole": most_applied_role,
-            "avgFitScore": avg_fit_score,
-            "totalCVs": total_cvs,
-            "rejected": rejected_count,
-            "shortlisted": shortlisted_count
+            "mostAppliedRole": metrics["most_applied_role"] or "No applications",
+            "avgFitScore": metrics["avg_score"],
+            "totalCVs": metrics["total"],
+            "rejected": metrics["rejected"],
+            "shortlisted": metrics["shortlisted"]
         }
     elif current_user.role == "hiring_manager":
         # Hiring manager metrics
-        candidates_collection = db.get_collection("candidates")
         job_roles_collection = db.get_collection("job_roles")
         users_collection = db.get_collection("users")
         # Get all job roles for this company
-        job_roles = await job_roles_collection.find({"company_id": current_user.company_code}).to_list(length=None)
-        job_role_ids = [str(jr["_id"]) for jr in job_roles]
-        # Get all candidates for these job roles
-        candidates = await candidates_collection.find({"job_role_id": {"$in": job_role_ids}}).to_list(length=None)
-        if not candidates:
+        job_roles = await job_roles_collection.find(
+            {"company_id": current_user.company_code}, {"title": 1}
+        ).to_list(length=None)
+        job_role_titles = {str(jr["_id"]): jr.get("title", "Unknown") for jr in job_roles}
+        metrics = await load_candidate_metrics(
+            "company", current_user.company_code,
+            {"company_id": current_user.company_code},
+            job_role_titles
+        )
+        if not metrics["total"]:
             return {
                 "mostAppliedRole": "No applications yet",
                 "avgFitScore": 0,
@@ -221,46 +265,32 @@ async def get_metrics(current_user: User = Depends(get_current_user)):
                 "topRecruiter": "N/A",
                 "lowestShortlisting": "N/A"
             }
-        # Most applied job role
-        role_counts = {}
-        for candidate in candidates:
-            role = candidate.get("job_role_title", "Unknown")
-            role_counts[role] = role_counts.get(role, 0) + 1
-        most_applied_role = max(role_counts.items(), key=lambda x: x[1])[0] if role_counts else "No applications"
-        # Average fit score
-        valid_scores = [c.get("ats_score", 0) for c in candidates if c.get("ats_score") is not None]
-        avg_fit_score = round(sum(valid_scores) / len(valid_scores), 1) if valid_scores else 0
-        # Total candidates
-        total_candidates = len(candidates)
-        # Top recruiter (highest accuracy from user model)
-        recruiters = await users_collection.find({"role": "recruiter", "company_code": current_user.company_code}).to_list(length=None)
-        from app.routes.users import add_recruiter_stats
-        recruiters_with_stats = [add_recruiter_stats(convert_id(r)) for r in recruiters]
-        if recruiters_with_stats:
-            top_recruiter_obj = max(recruiters_with_stats, key=lambda r: r.get("accuracy", 0))
+        # Top recruiter (highest stored accuracy)
+        recruiters = await users_collection.find(
+            {"role": "recruiter", "company_code": current_user.company_code},
+            {"full_name": 1, "accuracy": 1}
+        ).sort([("accuracy", -1), ("_id", 1)]).limit(1).to_list(length=1)
+        if recruiters:
+            top_recruiter_obj = recruiters[0]
             top_recruiter = f"{top_recruiter_obj.get('full_name', 'N/A')} ({top_recruiter_obj.get('accuracy', 0)}%)"
         else:
             top_recruiter = "N/A"
         # Lowest shortlisting rate (job role with lowest % of shortlisted candidates)
-        shortlist_rates = {}
-        for job_role in job_roles:
-            role_id = str(job_role["_id"])
-            role_candidates = [c for c in candidates if c.get("job_role_id") == role_id]
-            if not role_candidates:
-                continue
-            shortlisted = len([c for c in role_candidates if c.get("status") == "shortlisted"])
-            rate = shortlisted / len(role_candidates)
-            shortlist_rates[job_role.get("title", "Unknown")] = rate
+        shortlist_rates = {
+            job_role_titles[role_id]: counts["shortlisted"] / counts["total"]
+            for role_id, counts in metrics["roles"].items()
+            if counts["total"] and role_id in job_role_titles
+        }
         if shortlist_rates:
             lowest_shortlisting = min(shortlist_rates.items(), key=lambda x: x[1])[0]
         else:
             lowest_shortlisting = "N/A"
         return {
-            "mostAppliedRole": most_applied_role,
-            "avgFitScore": avg_fit_score,
-            "totalCandidates": total_candidates,
+            "mostAppliedRole": metrics["most_applied_role"] or "No applications",
+            "avgFitScore": metrics["avg_score"],
+            "totalCandidates": metrics["total"],
             "topRecruiter": top_recruiter,
             "lowestShortlisting": lowest_shortlisting
         }
     else:
-        raise HTTPException(status_code=403, detail="Not authorized") 
\ No newline at end of file
+        raise HTTPException(status_code=403, detail="Not authorized")
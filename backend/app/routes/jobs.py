@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException
+from bson import ObjectId
+
+from app.database import Database
+from app.routes.auth import get_current_user
+from app.models.user import User
+from app.models.background_job import BackgroundJobResponse
+from app.utils.cascade import JOBS
+from app.utils.mongo_utils import convert_id
+
+router = APIRouter()
+db = Database()
+
+@router.get("/{job_id}", response_model=BackgroundJobResponse)
+async def get_job_status(job_id: str, current_user: User = Depends(get_current_user)):
+    """Progress of a background job; hiring managers see their company's jobs, admins see all."""
+    if current_user.role not in ("hiring_manager", "admin"):
+        raise HTTPException(status_code=403, detail="You don't have permission to view background jobs")
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    query = {"_id": ObjectId(job_id)}
+    if current_user.role == "hiring_manager":
+        query["company_id"] = current_user.company_code
+    job = await db.get_collection(JOBS).find_one(query)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return BackgroundJobResponse(**convert_id(job))
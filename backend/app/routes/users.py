@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Optional
 from app.database import Database
 from app.routes.auth import get_current_user
 from app.models.user import User
 from app.utils.mongo_utils import convert_id
 from datetime import datetime, timedelta
 from bson import ObjectId
+from app.utils.ai_forward import ai_singleflight, ai_circuit
+from app.utils.progress import progress_broker
+from app.utils.principal_cache import principal_cache
+from app.utils.api_log import api_log_writer
+from app.utils.mongo_pool import pool_monitor
+from app.utils.cascade import cascade_runner
+from app.utils.api_metrics import merge_buckets, histogram_percentile
+from app.utils.response_cache import response_cache, cached_response, bump_company_versions
 
 router = APIRouter()
 db = Database()
@@ -22,7 +31,12 @@ def add_recruiter_stats(user):
     return user
 
 @router.get("/recruiters/")
-async def get_all_recruiters(current_user: User = Depends(get_current_user)):
+async def get_all_recruiters(request: Request, current_user: User = Depends(get_current_user)):
+    return await cached_response(
+        request, current_user.company_code, "recruiters", lambda: list_recruiters(current_user)
+    )
+
+async def list_recruiters(current_user: User) -> list:
     collection = db.get_collection("users")
     recruiters = await collection.find(
         {"role": "recruiter", "company_code": current_user.company_code}
@@ -32,11 +46,16 @@ async def get_all_recruiters(current_user: User = Depends(get_current_user)):
 
 
 @router.get("/recruiters/top")
-async def get_top_recruiters(current_user: User = Depends(get_current_user)):
+async def get_top_recruiters(request: Request, current_user: User = Depends(get_current_user)):
+    return await cached_response(
+        request, current_user.company_code, "recruiters_top", lambda: list_top_recruiters(current_user)
+    )
+
+async def list_top_recruiters(current_user: User) -> list:
     collection = db.get_collection("users")
     recruiters = await collection.find(
         {"role": "recruiter", "company_code": current_user.company_code}
-    ).sort("accuracy", -1).limit(3).to_list(length=3)
+    ).sort([("accuracy", -1), ("_id", 1)]).limit(3).to_list(length=3)
     return [add_recruiter_stats(convert_id(r)) for r in recruiters]
 
 @router.get("/all/")
@@ -51,25 +70,23 @@ async def get_all_users(current_user: User = Depends(get_current_user)):
 async def get_admin_metrics(current_user: User = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can view metrics.")
-    users_collection = db.get_collection("users")
-    companies_collection = db.get_collection("companies")
-    api_logs_collection = db.get_collection("api_logs")
+    users_collection = db.get_analytics_collection("users")
+    companies_collection = db.get_analytics_collection("companies")
+    api_metrics_collection = db.get_analytics_collection("api_metrics")
     stats_collection = db.get_collection("stats")
     # Count users, companies, CVs
-    total_users = await users_collection.count_documents({})
-    total_companies = await companies_collection.count_documents({})
+    total_users = await users_collection.estimated_document_count()
+    total_companies = await companies_collection.estimated_document_count()
     stats_doc = await stats_collection.find_one({"_id": "total_cvs_processed"})
     total_cvs = stats_doc["count"] if stats_doc and "count" in stats_doc else 0
-    # API calls
-    total_api_calls = await api_logs_collection.count_documents({})
+    # API calls, from the all-time bucket of every path
+    totals = await api_metrics_collection.find(
+        {"granularity": "all"}, {"path": 1, "count": 1}
+    ).to_list(length=None)
+    total_api_calls = sum(t.get("count", 0) for t in totals)
     # Most accessed endpoint
-    pipeline = [
-        {"$group": {"_id": "$path", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}},
-        {"$limit": 1}
-    ]
-    result = await api_logs_collection.aggregate(pipeline).to_list(length=1)
-    most_accessed_endpoint = result[0]["_id"] if result else "N/A"
+    most_accessed = max(totals, key=lambda t: t.get("count", 0), default=None)
+    most_accessed_endpoint = most_accessed["path"] if most_accessed else "N/A"
     return {
         "total_users": total_users,
         "total_companies": total_companies,
@@ -84,42 +101,70 @@ async def get_admin_metrics(current_user: User = Depends(get_current_user)):
 async def api_calls_over_time(current_user: User = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can view metrics.")
-    api_logs_collection = db.get_collection("api_logs")
+    api_metrics_collection = db.get_analytics_collection("api_metrics")
     # Last 14 days
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=13)
-    pipeline = [
-        {"$match": {"timestamp": {"$gte": start_date, "$lte": end_date}}},
-        {"$group": {
-            "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}},
-            "calls": {"$sum": 1}
-        }},
-        {"$sort": {"_id": 1}}
-    ]
-    results = await api_logs_collection.aggregate(pipeline).to_list(length=100)
+    start_day = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    buckets = await api_metrics_collection.find(
+        {"granularity": "day", "bucket": {"$gte": start_day}}, {"bucket": 1, "count": 1}
+    ).to_list(length=None)
     # Fill missing days
-    date_map = {r["_id"]: r["calls"] for r in results}
+    date_map = {}
+    for bucket in buckets:
+        day = bucket["bucket"].strftime("%Y-%m-%d")
+        date_map[day] = date_map.get(day, 0) + bucket.get("count", 0)
     dates = [(start_date + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(14)]
     return [{"date": d, "calls": date_map.get(d, 0)} for d in dates]
 
 @router.get("/admin/endpoint-performance")
-async def endpoint_performance(current_user: User = Depends(get_current_user)):
+async def endpoint_performance(
+    minutes: Optional[int] = Query(None, ge=1, le=24 * 60),
+    current_user: User = Depends(get_current_user)
+):
+    """Response times (ms) per endpoint, all-time or over the last `minutes` minutes."""
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can view metrics.")
-    api_logs_collection = db.get_collection("api_logs")
-    pipeline = [
-        {"$group": {
-            "_id": "$path",
-            "avg": {"$avg": "$response_time"},
-            "max": {"$max": "$response_time"}
-        }},
-        {"$sort": {"avg": -1}}
-    ]
-    results = await api_logs_collection.aggregate(pipeline).to_list(length=20)
-    return [
-        {"endpoint": r["_id"], "avg": round(r["avg"], 2), "max": r["max"]}
-        for r in results
-    ]
+    api_metrics_collection = db.get_analytics_collection("api_metrics")
+    if minutes:
+        since = datetime.utcnow().replace(second=0, microsecond=0) - timedelta(minutes=minutes - 1)
+        query = {"granularity": "minute", "bucket": {"$gte": since}}
+    else:
+        query = {"granularity": "all"}
+    by_path = {}
+    async for bucket in api_metrics_collection.find(query):
+        by_path.setdefault(bucket["path"], []).append(bucket)
+    results = []
+    for path, buckets in by_path.items():
+        merged = merge_buckets(buckets)
+        if not merged["count"]:
+            continue
+        results.append({
+            "endpoint": path,
+            "avg": round(merged["total_ms"] / merged["count"], 2),
+            "max": round(merged["max_ms"], 2),
+            "p50": histogram_percentile(merged["hist"], 50),
+            "p95": histogram_percentile(merged["hist"], 95),
+            "p99": histogram_percentile(merged["hist"], 99),
+            "count": merged["count"]
+        })
+    results.sort(key=lambda r: r["avg"], reverse=True)
+    return results[:20]
+
+@router.get("/admin/runtime-stats")
+async def runtime_stats(current_user: User = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can view metrics.")
+    return {
+        "ai_evaluations": ai_singleflight.stats(),
+        "ai_circuit": ai_circuit.stats(),
+        "progress_events": progress_broker.stats(),
+        "principal_cache": principal_cache.stats(),
+        "api_log": api_log_writer.stats(),
+        "response_cache": response_cache.stats(),
+        "mongo_pool": pool_monitor.stats(),
+        "cascade_jobs": cascade_runner.stats()
+    }
 
 @router.patch("/{user_id}/toggle-status")
 async def toggle_user_status(user_id: str, current_user: User = Depends(get_current_user)):
@@ -140,6 +185,8 @@ async def toggle_user_status(user_id: str, current_user: User = Depends(get_curr
         {"_id": ObjectId(user_id)},
         {"$set": {"is_active": new_status}}
     )
+    principal_cache.invalidate(user_to_update["email"])
+    await bump_company_versions(user_to_update.get("company_code"))
     
     return {"message": f"User status updated to {'active' if new_status else 'inactive'}", "is_active": new_status}
 
@@ -170,5 +217,7 @@ async def delete_recruiter_by_hiring_manager(
 
     if result.deleted_count == 0:
         raise HTTPException(status_code=500, detail="Failed to delete recruiter.")
+    principal_cache.invalidate(recruiter_to_delete["email"])
+    await bump_company_versions(recruiter_to_delete.get("company_code"))
 
     return
\ No newline at end of file
@@ -1,16 +1,82 @@
 import requests
+import hashlib
 import logging
 import os
 import subprocess
 import tempfile
 import json
+from typing import Dict, Optional
+from starlette.concurrency import run_in_threadpool
+from app.utils.singleflight import SingleFlight
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.deadline import Deadline
+from app.config import (
+    AI_REQUEST_TIMEOUT_SECONDS,
+    AI_LOCAL_FALLBACK_TIMEOUT_SECONDS,
+    AI_CIRCUIT_FAILURE_THRESHOLD,
+    AI_CIRCUIT_RESET_SECONDS,
+    AI_HEALTH_CHECK_TIMEOUT_SECONDS
+)
 
 logger = logging.getLogger(__name__)
 
 AI_API_URL = "https://cv-align.onrender.com/api/evaluate/"  #  deployed Render URL with trailing slash
+AI_HEALTH_URL = "https://cv-align.onrender.com/api/stats/"
 
-def send_cv_to_ai_server(cv_file, jd_text):
+def check_ai_server_health() -> bool:
+    response = requests.get(AI_HEALTH_URL, timeout=AI_HEALTH_CHECK_TIMEOUT_SECONDS)
+    return response.status_code < 500
+
+# Skip the deployed API while it is known to be down
+ai_circuit = CircuitBreaker(
+    "ai_api",
+    failure_threshold=AI_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=AI_CIRCUIT_RESET_SECONDS,
+    health_check=check_ai_server_health
+)
+
+# Identical CV/JD evaluations that are running right now share one AI call
+ai_singleflight = SingleFlight()
+
+# Budget of each shared evaluation, extended to the latest deadline among the callers waiting on it
+shared_deadlines: Dict[tuple, Deadline] = {}
+
+async def evaluate_cv(cv_file: bytes, jd_text: str, deadline: Optional[Deadline] = None) -> dict:
+    """
+    Evaluate a CV against a job description, coalescing identical concurrent
+    requests. The shared call runs on its own budget, as long as the most
+    patient caller's, so a fresh retry that joins a nearly expired call is
+    not handed its "deadline exceeded" placeholder; each caller only bounds
+    its own wait.
+    """
+    key = (hashlib.sha256(cv_file).hexdigest(), hashlib.sha256(jd_text.encode()).hexdigest())
+    shared = shared_deadlines.get(key)
+    if shared is not None:
+        shared.extend(deadline)
+    elif key not in ai_singleflight.calls:
+        shared = Deadline(deadline.remaining() if deadline else float("inf"))
+        shared_deadlines[key] = shared
+    return await ai_singleflight.do(
+        key, _evaluate_shared, key, cv_file, jd_text, shared,
+        timeout=deadline.remaining() if deadline else None
+    )
+
+async def _evaluate_shared(key: tuple, cv_file: bytes, jd_text: str, deadline: Deadline) -> dict:
+    try:
+        return await run_in_threadpool(send_cv_to_ai_server, cv_file, jd_text, deadline)
+    finally:
+        shared_deadlines.pop(key, None)
+
+def send_cv_to_ai_server(cv_file, jd_text, deadline: Optional[Deadline] = None):
     """Send CV file and job description to the deployed AI API."""
+    if not ai_circuit.allow_request():
+        logger.warning("AI API circuit is open - using local fallback")
+        return use_local_ai_fallback(cv_file, jd_text, deadline)
+    
+    timeout = deadline.timeout(AI_REQUEST_TIMEOUT_SECONDS) if deadline else AI_REQUEST_TIMEOUT_SECONDS
+    if timeout <= 0:
+        return create_fallback_response("Upload deadline exceeded before the AI API was called")
+    
     try:
         files = {"cv": ("cv.pdf", cv_file, "application/pdf")}
         data = {"jd": jd_text}  
@@ -19,30 +85,41 @@ def send_cv_to_ai_server(cv_file, jd_text):
         logger.info(f"Job description length: {len(jd_text)}")
         logger.info(f"CV file size: {len(cv_file)} bytes")
         
-        response = requests.post(AI_API_URL, files=files, data=data, timeout=60)
+        response = requests.post(AI_API_URL, files=files, data=data, timeout=timeout)
         
         logger.info(f"AI API response status: {response.status_code}")
         
         if response.status_code == 200:
+            ai_circuit.record_success()
             result = response.json()
             logger.info(f"AI API response: {result}")
             return result
         else:
+            if response.status_code >= 500:
+                ai_circuit.record_failure()
             logger.error(f"AI API error: {response.status_code} - {response.text}")
             raise Exception(f"AI API returned status {response.status_code}: {response.text}")
             
     except requests.exceptions.Timeout:
+        # A timeout cut short by the caller's deadline says nothing about the remote's health
+        if timeout >= AI_REQUEST_TIMEOUT_SECONDS:
+            ai_circuit.record_failure()
         logger.error("AI API request timed out - trying local fallback")
-        return use_local_ai_fallback(cv_file, jd_text)
+        return use_local_ai_fallback(cv_file, jd_text, deadline)
     except requests.exceptions.RequestException as e:
+        ai_circuit.record_failure()
         logger.error(f"AI API request failed: {str(e)} - trying local fallback")
-        return use_local_ai_fallback(cv_file, jd_text)
+        return use_local_ai_fallback(cv_file, jd_text, deadline)
     except Exception as e:
         logger.error(f"Unexpected error in AI API call: {str(e)} - trying local fallback")
-        return use_local_ai_fallback(cv_file, jd_text)
+        return use_local_ai_fallback(cv_file, jd_text, deadline)
 
-def use_local_ai_fallback(cv_file, jd_text):
+def use_local_ai_fallback(cv_file, jd_text, deadline: Optional[Deadline] = None):
     """Fallback to local AI script if deployed API fails"""
+    timeout = deadline.timeout(AI_LOCAL_FALLBACK_TIMEOUT_SECONDS) if deadline else AI_LOCAL_FALLBACK_TIMEOUT_SECONDS
+    if timeout <= 0:
+        logger.error("Upload deadline exceeded - skipping local AI fallback")
+        return create_fallback_response("Upload deadline exceeded before the local AI fallback could run")
     try:
         logger.info("Using local AI script fallback")
         
@@ -62,7 +139,7 @@ def use_local_ai_fallback(cv_file, jd_text):
                 capture_output=True,
                 text=True,
                 check=True,
-                timeout=120
+                timeout=timeout
             )
             
             # Parse the output
@@ -104,5 +181,6 @@ def create_fallback_response(error_message):
         "weaknesses": ["Analysis pending"],
         "feedback": f"AI analysis failed: {error_message}",
         "detailed_feedback": f"The CV was uploaded successfully but AI analysis failed. Error: {error_message}. Please try again later or contact support.",
-        "eligibility": "unknown"
+        "eligibility": "unknown",
+        "analysis_failed": True
     }
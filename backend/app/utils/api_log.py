@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Iterable, Optional
+
+from starlette.routing import Match, Mount
+from app.config import API_LOG_BATCH_SIZE, API_LOG_FLUSH_SECONDS, API_LOG_MAX_BUFFER
+from app.database import Database
+from app.utils.api_metrics import api_metrics_updates
+
+logger = logging.getLogger(__name__)
+
+# Logged path of requests that matched no route, e.g. 404s for unknown URLs
+UNMATCHED_PATH = "<unmatched>"
+
+
+def route_template(scope: dict, root_path: str = "") -> str:
+    """
+    Path template of the route that handled a request, read after routing,
+    so every /candidates/<id> is logged as /candidates/{candidate_id}.
+    Mounted apps (the local CV files) log as their prefix plus /{path}.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    mounted = scope.get("root_path", "")
+    if mounted != root_path:
+        return mounted[len(root_path):] + "/{path}"
+    return UNMATCHED_PATH
+
+
+def template_for_path(routes: Iterable, path: str, method: str) -> str:
+    """Route template for a raw path, for entries logged before templates were recorded."""
+    partial = None
+    for route in routes:
+        match, _ = route.matches({"type": "http", "path": path, "method": method, "root_path": ""})
+        if match == Match.NONE:
+            continue
+        template = route.path + "/{path}" if isinstance(route, Mount) else route.path
+        if match == Match.FULL:
+            return template
+        partial = partial or template
+    return partial or UNMATCHED_PATH
+
+
+class ApiLogWriter:
+    """
+    Buffers API log entries in memory and writes them with insert_many
+    when a batch fills up or the flush interval passes, folding each batch
+    into the `api_metrics` rollups. Recording never waits on MongoDB; when
+    the buffer is full new entries are dropped.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = API_LOG_BATCH_SIZE,
+        flush_interval: float = API_LOG_FLUSH_SECONDS,
+        max_buffer: int = API_LOG_MAX_BUFFER
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.buffer = []
+        self.batch_ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def record(self, entry: dict):
+        if len(self.buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+        self.buffer.append(entry)
+        if len(self.buffer) >= self.batch_size:
+            self.batch_ready.set()
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and write whatever is still buffered."""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        while self.buffer:
+            await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.batch_ready.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.batch_ready.clear()
+            await self.flush()
+
+    async def flush(self):
+        if not self.buffer:
+            return
+        batch = self.buffer[:self.batch_size]
+        del self.buffer[:self.batch_size]
+        if len(self.buffer) >= self.batch_size:
+            self.batch_ready.set()
+        try:
+            await Database.get_collection("api_logs").insert_many(batch, ordered=False)
+            self.written += len(batch)
+        except Exception as e:
+            # Logging must never take the API down; the batch is lost
+            self.failed += len(batch)
+            logger.warning(f"Failed to write {len(batch)} API log entries: {str(e)}")
+        try:
+            await Database.get_collection("api_metrics").bulk_write(api_metrics_updates(batch), ordered=False)
+        except Exception as e:
+            logger.warning(f"Failed to update API metrics for {len(batch)} entries: {str(e)}")
+        self.flushes += 1
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self.buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
+
+
+class APILogMiddleware:
+    """
+    ASGI middleware that records the route template, method, status and
+    response time (milliseconds to the response headers) for every HTTP
+    request. Logging templates rather than raw paths keeps the number of
+    metrics buckets bounded by the number of routes.
+    """
+
+    def __init__(self, app, writer: ApiLogWriter):
+        self.app = app
+        self.writer = writer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timestamp = datetime.utcnow()
+        start = time.perf_counter()
+        root_path = scope.get("root_path", "")
+        logged = False
+
+        def log(status_code: int):
+            nonlocal logged
+            logged = True
+            duration = time.perf_counter() - start
+            self.writer.record({
+                "path": route_template(scope, root_path),
+                "method": scope["method"],
+                "status_code": status_code,
+                "timestamp": timestamp,
+                "duration": duration,
+                "response_time": round(duration * 1000, 3),
+            })
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and not logged:
+                log(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            if not logged:
+                log(500)
+            raise
+
+
+api_log_writer = ApiLogWriter()
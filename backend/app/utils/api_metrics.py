@@ -0,0 +1,96 @@
+"""
+Pre-aggregated API request metrics.
+
+Every flushed batch of API log entries is folded into `api_metrics`
+documents per path at three granularities: one bucket per minute
+(expired after API_METRICS_MINUTE_RETENTION_DAYS), one per day and one
+all-time total. Each bucket keeps a count, the summed and maximum
+response time and a latency histogram, so dashboards read a bounded
+number of small documents and can still estimate percentiles.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+from app.config import API_METRICS_MINUTE_RETENTION_DAYS
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [
+    1, 2, 3, 5, 7, 10, 15, 20, 30, 50, 70, 100, 150, 200, 300, 500, 700,
+    1000, 1500, 2000, 3000, 5000, 7000, 10000, 15000, 30000, 60000
+]
+
+
+def latency_bucket(response_time_ms: float) -> int:
+    return bisect_left(LATENCY_BUCKETS_MS, response_time_ms)
+
+
+def _buckets(timestamp: datetime):
+    minute = timestamp.replace(second=0, microsecond=0)
+    day = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    return [("minute", minute), ("day", day), ("all", None)]
+
+
+def api_metrics_updates(entries: Iterable[dict]) -> List[UpdateOne]:
+    """Sum a batch of log entries per bucket and return one upsert per touched bucket."""
+    buckets = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "hist": defaultdict(int)})
+    for entry in entries:
+        response_time = entry.get("response_time")
+        if response_time is None:
+            response_time = entry.get("duration", 0) * 1000
+        histogram_bucket = str(latency_bucket(response_time))
+        for granularity, bucket in _buckets(entry["timestamp"]):
+            totals = buckets[(granularity, bucket, entry["path"])]
+            totals["count"] += 1
+            totals["total_ms"] += response_time
+            totals["max_ms"] = max(totals["max_ms"], response_time)
+            totals["hist"][histogram_bucket] += 1
+
+    updates = []
+    for (granularity, bucket, path), totals in buckets.items():
+        on_insert = {"granularity": granularity, "bucket": bucket, "path": path}
+        if granularity == "minute":
+            on_insert["expires_at"] = bucket + timedelta(days=API_METRICS_MINUTE_RETENTION_DAYS)
+        increments = {"count": totals["count"], "total_ms": totals["total_ms"]}
+        increments.update({f"hist.{i}": n for i, n in totals["hist"].items()})
+        bucket_key = bucket.isoformat() if bucket else "all"
+        updates.append(UpdateOne(
+            {"_id": f"{granularity}|{bucket_key}|{path}"},
+            {"$inc": increments, "$max": {"max_ms": totals["max_ms"]}, "$setOnInsert": on_insert},
+            upsert=True
+        ))
+    return updates
+
+
+def merge_buckets(documents: Iterable[dict]) -> dict:
+    """Combine bucket documents into one count, sum, max and histogram."""
+    merged = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "hist": defaultdict(int)}
+    for document in documents:
+        merged["count"] += document.get("count", 0)
+        merged["total_ms"] += document.get("total_ms", 0.0)
+        merged["max_ms"] = max(merged["max_ms"], document.get("max_ms", 0.0))
+        for i, n in document.get("hist", {}).items():
+            merged["hist"][i] += n
+    return merged
+
+
+def histogram_percentile(hist: dict, p: float) -> Optional[float]:
+    """Estimate the p-th percentile (ms) by interpolating inside the histogram bucket that holds it."""
+    total = sum(hist.values())
+    if not total:
+        return None
+    rank = p / 100 * total
+    seen = 0
+    for i in range(len(LATENCY_BUCKETS_MS) + 1):
+        n = hist.get(str(i), 0)
+        if n and seen + n >= rank:
+            lower = LATENCY_BUCKETS_MS[i - 1] if i > 0 else 0
+            if i == len(LATENCY_BUCKETS_MS):
+                return float(lower)
+            upper = LATENCY_BUCKETS_MS[i]
+            return round(lower + (upper - lower) * (rank - seen) / n, 2)
+        seen += n
+    return float(LATENCY_BUCKETS_MS[-1])
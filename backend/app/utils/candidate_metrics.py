@@ -0,0 +1,55 @@
+"""Aggregation pipelines that compute dashboard metrics inside MongoDB."""
+
+
+def _count_status(status: str) -> dict:
+    return {"$sum": {"$cond": [{"$eq": ["$status", status]}, 1, 0]}}
+
+
+def candidate_metrics_pipeline(match: dict) -> list:
+    """
+    One round trip returning totals, the most applied role and per-role
+    shortlisting counts for the candidates matching `match`.
+    """
+    return [
+        {"$match": match},
+        {"$facet": {
+            "totals": [
+                {"$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "avg_score": {"$avg": "$ats_score"},
+                    "rejected": _count_status("rejected"),
+                    "shortlisted": _count_status("shortlisted"),
+                }}
+            ],
+            "most_applied_role": [
+                {"$group": {"_id": {"$ifNull": ["$job_role_title", "Unknown"]}, "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+                {"$limit": 1}
+            ],
+            "roles": [
+                {"$group": {
+                    "_id": "$job_role_id",
+                    "total": {"$sum": 1},
+                    "shortlisted": _count_status("shortlisted"),
+                }}
+            ],
+        }}
+    ]
+
+
+async def compute_candidate_metrics(collection, match: dict) -> dict:
+    """Run the metrics pipeline and flatten its facets into plain numbers."""
+    result = await collection.aggregate(candidate_metrics_pipeline(match)).to_list(length=1)
+    facets = result[0] if result else {}
+    totals = facets.get("totals") or [{}]
+    most_applied = facets.get("most_applied_role") or []
+    avg_score = totals[0].get("avg_score")
+    return {
+        "total": totals[0].get("total", 0),
+        "avg_score": round(avg_score, 1) if avg_score is not None else 0,
+        "rejected": totals[0].get("rejected", 0),
+        "shortlisted": totals[0].get("shortlisted", 0),
+        "most_applied_role": most_applied[0]["_id"] if most_applied else None,
+        "roles": {r["_id"]: {"total": r["total"], "shortlisted": r["shortlisted"]} for r in facets.get("roles", [])},
+    }
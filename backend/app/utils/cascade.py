@@ -0,0 +1,266 @@
+"""
+Background cleanup of the candidates of deleted job roles.
+
+Deleting a job role enqueues a cascade job in `background_jobs`. The job
+removes the role's candidates in batches of CASCADE_BATCH_SIZE, optionally
+copying them to `candidates_archive` first, and pauses
+CASCADE_BATCH_DELAY_SECONDS between batches so cleanup never competes with
+request traffic. Progress is written to the job document after every batch.
+
+A job is created with an upsert guarded by a unique index, so a role has at
+most one active job. Workers claim a job atomically and hold it with a lease
+renewed after every batch; a job whose worker died is claimed again once
+its lease expires; every worker looks for such jobs once per lease period.
+Each batch is removed with one delete_many. When it deletes the whole
+batch, the rollup counters are adjusted for all of it; when a concurrent
+delete got to some of the candidates first, there is no telling which, so
+the batch is left to rollup reconciliation rather than counted twice.
+`sweep_orphans` finds candidates whose job role no longer exists and
+enqueues a cascade for each missing role.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReplaceOne, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.config import (
+    CASCADE_BATCH_SIZE,
+    CASCADE_BATCH_DELAY_SECONDS,
+    CASCADE_LEASE_SECONDS,
+    ORPHAN_SWEEP_ARCHIVE
+)
+from app.database import Database
+from app.utils.leases import WORKER_ID, acquire_lease
+from app.utils.rollups import record_candidate_changes
+
+logger = logging.getLogger(__name__)
+
+JOBS = "background_jobs"
+ARCHIVE = "candidates_archive"
+ACTIVE_STATUSES = ["queued", "running"]
+ORPHAN_SWEEP_LEASE = "orphan_sweep"
+
+# Fields record_candidate_changes reads when a candidate is removed
+ROLLUP_PROJECTION = {"recruiter_id": 1, "job_role_id": 1, "company_id": 1, "status": 1, "ats_score": 1}
+
+
+async def create_cascade_job(
+    job_role_id: str,
+    company_id: Optional[str],
+    archive: bool,
+    created_by: Optional[str],
+    reason: str = "job_role_deleted"
+) -> str:
+    """Enqueue a cascade for a job role, or return the one already active for it."""
+    jobs = Database.get_collection(JOBS)
+    now = datetime.utcnow()
+    while True:
+        try:
+            # The upsert copies job_role_id and active from the filter into a new job
+            job = await jobs.find_one_and_update(
+                {"job_role_id": job_role_id, "active": True},
+                {"$setOnInsert": {
+                    "type": "cascade",
+                    "reason": reason,
+                    "company_id": company_id,
+                    "mode": "archive" if archive else "delete",
+                    "status": "queued",
+                    "total": None,
+                    "processed": 0,
+                    "error": None,
+                    "created_by": created_by,
+                    "created_at": now,
+                    "updated_at": now,
+                    "started_at": None,
+                    "finished_at": None,
+                }},
+                projection={"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return str(job["_id"])
+        except DuplicateKeyError:
+            # A concurrent request created the job first; the next attempt returns it
+            continue
+
+
+class CascadeRunner:
+    """Runs cascade jobs as background tasks, one task per job claimed by this worker."""
+
+    def __init__(
+        self,
+        batch_size: int = CASCADE_BATCH_SIZE,
+        delay: float = CASCADE_BATCH_DELAY_SECONDS,
+        lease: float = CASCADE_LEASE_SECONDS
+    ):
+        self.batch_size = batch_size
+        self.delay = delay
+        self.lease = lease
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.completed = 0
+        self.failed = 0
+        self.removed = 0
+
+    def submit(self, job_id: str):
+        if job_id in self.tasks:
+            return
+        task = asyncio.create_task(self._run(job_id))
+        self.tasks[job_id] = task
+        task.add_done_callback(lambda _: self.tasks.pop(job_id, None))
+
+    async def resume(self):
+        """Try to claim jobs that are queued or whose worker stopped renewing their lease."""
+        pending = await Database.get_collection(JOBS).find(
+            {"status": {"$in": ACTIVE_STATUSES}}, {"_id": 1}
+        ).to_list(length=None)
+        for job in pending:
+            self.submit(str(job["_id"]))
+
+    async def stop(self):
+        """Cancel running jobs; another worker claims them once their leases expire."""
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _claim(self, job_id: str) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await Database.get_collection(JOBS).find_one_and_update(
+            {"_id": ObjectId(job_id), "$or": [
+                {"status": "queued"},
+                {"status": "running", "lease_expires_at": {"$lte": now}},
+                {"status": "running", "lease_expires_at": None},
+            ]},
+            {"$set": {
+                "status": "running",
+                "owner": WORKER_ID,
+                "lease_expires_at": now + timedelta(seconds=self.lease),
+                "updated_at": now,
+            }},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _update_owned(self, job: dict, update: dict) -> bool:
+        """Apply an update only while this worker still owns the job."""
+        result = await Database.get_collection(JOBS).update_one({"_id": job["_id"], "owner": WORKER_ID}, update)
+        return result.matched_count > 0
+
+    async def _run(self, job_id: str):
+        job = await self._claim(job_id)
+        if not job:
+            return
+        candidates = Database.get_collection("candidates")
+        query = {"job_role_id": job["job_role_id"]}
+        archive = job["mode"] == "archive"
+        try:
+            now = datetime.utcnow()
+            total = job["processed"] + await candidates.count_documents(query)
+            await self._update_owned(job, {"$set": {"total": total, "started_at": job["started_at"] or now}})
+            while True:
+                batch = await candidates.find(query, None if archive else ROLLUP_PROJECTION).limit(
+                    self.batch_size
+                ).to_list(length=self.batch_size)
+                if not batch:
+                    break
+                removed = await self._remove(batch, archive)
+                if removed == len(batch):
+                    await record_candidate_changes([
+                        ({**candidate, "company_id": candidate.get("company_id") or job["company_id"]}, None)
+                        for candidate in batch
+                    ])
+                else:
+                    logger.warning(
+                        f"Cascade job {job_id} removed {removed} of {len(batch)} candidates; "
+                        "leaving their counters to rollup reconciliation"
+                    )
+                self.removed += removed
+                now = datetime.utcnow()
+                if not await self._update_owned(job, {
+                    "$inc": {"processed": removed},
+                    "$set": {"updated_at": now, "lease_expires_at": now + timedelta(seconds=self.lease)}
+                }):
+                    logger.warning(f"Cascade job {job_id} was claimed by another worker; stopping")
+                    return
+                await asyncio.sleep(self.delay)
+            now = datetime.utcnow()
+            await self._update_owned(job, {
+                "$set": {"status": "completed", "finished_at": now, "updated_at": now},
+                "$unset": {"active": "", "lease_expires_at": ""}
+            })
+            self.completed += 1
+            logger.info(f"Cascade job {job_id} removed the candidates of job role {job['job_role_id']}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Cascade job {job_id} failed: {str(e)}")
+            now = datetime.utcnow()
+            await self._update_owned(job, {
+                "$set": {"status": "failed", "error": str(e), "finished_at": now, "updated_at": now},
+                "$unset": {"active": "", "lease_expires_at": ""}
+            })
+
+    async def _remove(self, batch: List[dict], archive: bool) -> int:
+        """Delete a batch and return how many of its candidates this call actually deleted."""
+        if archive:
+            # Copy before deleting so a crash in between loses nothing; upserts keep retries idempotent
+            archived_at = datetime.utcnow()
+            await Database.get_collection(ARCHIVE).bulk_write(
+                [ReplaceOne({"_id": c["_id"]}, {**c, "archived_at": archived_at}, upsert=True) for c in batch],
+                ordered=False
+            )
+        result = await Database.get_collection("candidates").delete_many({"_id": {"$in": [c["_id"] for c in batch]}})
+        return result.deleted_count
+
+    def stats(self) -> dict:
+        return {
+            "running": len(self.tasks),
+            "completed": self.completed,
+            "failed": self.failed,
+            "candidates_removed": self.removed,
+        }
+
+
+cascade_runner = CascadeRunner()
+
+
+async def sweep_orphans() -> int:
+    """Enqueue a cascade for every job_role_id referenced by candidates that has no job role; returns how many."""
+    role_ids = await Database.get_collection("candidates").distinct("job_role_id")
+    object_ids = [ObjectId(role_id) for role_id in role_ids if isinstance(role_id, str) and ObjectId.is_valid(role_id)]
+    existing = await Database.get_collection("job_roles").find(
+        {"_id": {"$in": object_ids}}, {"_id": 1}
+    ).to_list(length=None)
+    existing_ids = {str(job_role["_id"]) for job_role in existing}
+    orphans = [role_id for role_id in role_ids if role_id is not None and role_id not in existing_ids]
+    for role_id in orphans:
+        job_id = await create_cascade_job(role_id, None, ORPHAN_SWEEP_ARCHIVE, None, reason="orphan_sweep")
+        cascade_runner.submit(job_id)
+    if orphans:
+        logger.info(f"Orphan sweep queued cleanup for {len(orphans)} missing job roles")
+    return len(orphans)
+
+
+async def resume_cascades_periodically(interval: float):
+    """Every interval, pick up queued jobs and jobs whose worker stopped renewing their lease."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await cascade_runner.resume()
+        except Exception as e:
+            logger.error(f"Resuming cascade jobs failed: {str(e)}")
+
+
+async def sweep_orphans_periodically(interval: float):
+    """Every interval, in the one worker holding the sweep lease, look for orphaned candidates."""
+    while True:
+        try:
+            if await acquire_lease(ORPHAN_SWEEP_LEASE, interval):
+                await sweep_orphans()
+        except Exception as e:
+            logger.error(f"Orphan sweep failed: {str(e)}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for a remote dependency.
+    After `failure_threshold` consecutive failures the circuit opens and
+    callers fail over immediately. Once `reset_timeout` has passed, one
+    caller runs `health_check`; success closes the circuit, failure keeps
+    it open for another period. Safe to use from worker threads.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        health_check: Optional[Callable[[], bool]] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.health_check = health_check
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.short_circuited = 0
+        self.lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN or time.monotonic() - self.opened_at < self.reset_timeout:
+                self.short_circuited += 1
+                return False
+            # Only this caller probes; everyone else keeps failing over meanwhile
+            self.state = self.HALF_OPEN
+        healthy = self._probe()
+        with self.lock:
+            if healthy:
+                logger.info(f"Circuit {self.name} closed after successful health check")
+                self.state = self.CLOSED
+                self.failures = 0
+            else:
+                self._open()
+                self.short_circuited += 1
+        return healthy
+
+    def _probe(self) -> bool:
+        if self.health_check is None:
+            return True
+        try:
+            return bool(self.health_check())
+        except Exception as e:
+            logger.warning(f"Circuit {self.name} health check failed: {str(e)}")
+            return False
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state != self.OPEN and self.failures >= self.failure_threshold:
+                logger.warning(f"Circuit {self.name} opened after {self.failures} consecutive failures")
+                self._open()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "short_circuited": self.short_circuited,
+        }
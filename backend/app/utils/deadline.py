@@ -0,0 +1,23 @@
+import time
+
+
+class Deadline:
+    """An end-to-end time budget that is passed down to every downstream call."""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def timeout(self, cap: float) -> float:
+        """The timeout for a stage: its own cap or what is left of the budget, whichever is smaller."""
+        return min(cap, self.remaining())
+
+    def extend(self, other: "Deadline | None"):
+        """Push the end of the budget out to another deadline's; None means no deadline at all."""
+        self.expires_at = float("inf") if other is None else max(self.expires_at, other.expires_at)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
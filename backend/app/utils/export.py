@@ -0,0 +1,66 @@
+"""Row encoders for streaming candidate exports as CSV or NDJSON."""
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, List
+
+import orjson
+
+EXPORT_COLUMNS = [
+    "id", "candidate_name", "degree", "course", "cgpa", "ats_score", "strengths", "weaknesses",
+    "feedback", "detailed_feedback", "cv_url", "recruiter_id", "job_role_id", "job_role_title",
+    "status", "created_at",
+]
+DEFAULT_EXPORT_COLUMNS = [
+    "id", "candidate_name", "degree", "course", "cgpa", "ats_score", "status", "job_role_title",
+    "created_at", "cv_url",
+]
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def export_projection(columns: List[str]) -> dict:
+    return {("_id" if column == "id" else column): 1 for column in columns}
+
+
+def _row(document: dict, columns: List[str]) -> dict:
+    return {
+        column: str(document["_id"]) if column == "id" else document.get(column)
+        for column in columns
+    }
+
+
+# Spreadsheets evaluate cells starting with these characters as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        value = "; ".join(str(v) for v in value)
+    elif isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Names and feedback come from applicants' CVs; keep them as text when the file is opened
+        return "'" + value
+    return value
+
+
+async def encode_csv(batches: AsyncIterator[List[dict]], columns: List[str]) -> AsyncIterator[str]:
+    """Yield the CSV header, then one chunk per batch of documents."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for document in batch:
+            row = _row(document, columns)
+            writer.writerow([_csv_value(row[column]) for column in columns])
+        yield buffer.getvalue()
+
+
+async def encode_ndjson(batches: AsyncIterator[List[dict]], columns: List[str]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(orjson.dumps(_row(document, columns)) + b"\n" for document in batch)
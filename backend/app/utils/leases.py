@@ -0,0 +1,39 @@
+"""
+Leases that let one worker at a time run a periodic or background task.
+
+A lease is a document in `leases` naming its owner and when it expires.
+Acquiring succeeds when the lease is free, expired or already held by the
+caller, so a worker that dies simply lets its lease run out.
+"""
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo.errors import DuplicateKeyError
+
+from app.database import Database
+
+LEASES = "leases"
+
+# Identifies this process as a lease owner
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+async def acquire_lease(name: str, ttl: float, owner: str = WORKER_ID) -> bool:
+    """Take or renew the lease `name` for `ttl` seconds; False if another owner holds it."""
+    now = datetime.utcnow()
+    try:
+        # When the lease is held by someone else the filter misses and the upsert hits the _id index
+        await Database.get_collection(LEASES).update_one(
+            {"_id": name, "$or": [{"expires_at": {"$lte": now}}, {"owner": owner}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl), "renewed_at": now}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+async def release_lease(name: str, owner: str = WORKER_ID):
+    await Database.get_collection(LEASES).delete_one({"_id": name, "owner": owner})
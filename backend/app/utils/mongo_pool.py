@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import deque
+
+from pymongo import monitoring
+
+
+class PoolWaitMonitor(monitoring.ConnectionPoolListener):
+    """
+    Records how long operations wait to check a connection out of the
+    pool. PyMongo emits the start and end of a checkout on the same
+    thread, so the start time is kept in a thread local.
+    """
+
+    def __init__(self, window: int = 10000):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.waits = deque(maxlen=window)
+        self.checkouts = 0
+        self.failed_checkouts = {}
+        self.connections_open = 0
+        self.pools_cleared = 0
+
+    def connection_check_out_started(self, event):
+        self.local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self.local, "started", None)
+        with self.lock:
+            self.checkouts += 1
+            if started is not None:
+                self.waits.append(time.perf_counter() - started)
+
+    def connection_check_out_failed(self, event):
+        with self.lock:
+            self.failed_checkouts[event.reason] = self.failed_checkouts.get(event.reason, 0) + 1
+
+    def connection_created(self, event):
+        with self.lock:
+            self.connections_open += 1
+
+    def connection_closed(self, event):
+        with self.lock:
+            self.connections_open -= 1
+
+    def pool_cleared(self, event):
+        with self.lock:
+            self.pools_cleared += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+    def stats(self) -> dict:
+        with self.lock:
+            waits = sorted(self.waits)
+            stats = {
+                "checkouts": self.checkouts,
+                "failed_checkouts": dict(self.failed_checkouts),
+                "connections_open": self.connections_open,
+                "pools_cleared": self.pools_cleared,
+            }
+        for p in (50, 95, 99):
+            value = waits[min(len(waits) - 1, int(p / 100 * len(waits)))] if waits else 0.0
+            stats[f"wait_p{p}_ms"] = round(value * 1000, 3)
+        stats["wait_max_ms"] = round(waits[-1] * 1000, 3) if waits else 0.0
+        return stats
+
+
+pool_monitor = PoolWaitMonitor()
@@ -0,0 +1,61 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+# Newest first, with _id breaking ties between equal timestamps
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+
+def encode_cursor(doc: dict) -> str:
+    """Encode the (created_at, _id) position of a document as an opaque cursor."""
+    created_at = doc.get("created_at")
+    payload = {"t": created_at.isoformat() if created_at else None, "i": str(doc["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], ObjectId]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at = datetime.fromisoformat(payload["t"]) if payload["t"] else None
+        return created_at, ObjectId(payload["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after_cursor(created_at: Optional[datetime], object_id: ObjectId) -> dict:
+    """Filter for documents that sort after the cursor position in KEYSET_SORT order."""
+    if created_at is None:
+        # Legacy documents without created_at sort last; page through them by _id
+        return {"created_at": None, "_id": {"$lt": object_id}}
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": object_id}},
+        {"created_at": None},
+    ]}
+
+
+def encode_score_cursor(score: float, object_id: ObjectId) -> str:
+    """Encode the (score, _id) position of a ranked or search result as an opaque cursor."""
+    payload = {"s": score, "i": str(object_id)}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_score_cursor(cursor: str) -> Tuple[float, ObjectId]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(payload["s"]), ObjectId(payload["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def fetch_page(collection, query: dict, cursor: Optional[str], limit: int, projection: Optional[dict] = None):
+    """Return one page of documents and the cursor for the next page (None on the last page)."""
+    if cursor:
+        query = {"$and": [query, after_cursor(*decode_cursor(cursor))]}
+    docs = await collection.find(query, projection).sort(KEYSET_SORT).limit(limit + 1).to_list(length=limit + 1)
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    return docs[:limit], next_cursor
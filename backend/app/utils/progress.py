@@ -0,0 +1,86 @@
+import asyncio
+import itertools
+import logging
+from datetime import datetime
+from typing import Optional
+
+from app.config import PROGRESS_BUFFER_SIZE
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_STAGES = ["queued", "parsing", "evaluating", "done", "failed"]
+
+
+class Subscription:
+    """A subscriber's bounded event buffer. When full, the oldest event is dropped."""
+
+    def __init__(self, scope: tuple, buffer_size: int):
+        self.scope = scope
+        self.queue = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = 0
+
+    def deliver(self, event: dict):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def next_event(self, timeout: float) -> Optional[dict]:
+        """Wait for the next event, returning None if nothing arrives within the timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ProgressBroker:
+    """
+    In-process pub/sub for candidate analysis progress.
+    Subscribers are indexed by scope (recruiter, company or everything)
+    so publishing only touches the buffers that should see the event.
+    """
+
+    def __init__(self, buffer_size: int = PROGRESS_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.subscribers = {}
+        self.sequence = itertools.count(1)
+        self.published = 0
+
+    def subscribe(self, scope: str, key: Optional[str] = None) -> Subscription:
+        """Subscribe to a "recruiter" or "company" scope, which needs its id, or to "all" events."""
+        if scope == "all":
+            key = None
+        elif scope not in ("recruiter", "company") or not key:
+            raise ValueError(f"Invalid progress scope: {scope}={key!r}")
+        scope = (scope, key)
+        subscription = Subscription(scope, self.buffer_size)
+        self.subscribers.setdefault(scope, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self.subscribers.get(subscription.scope)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.subscribers[subscription.scope]
+
+    def publish(self, event: dict):
+        """Fan an event out to every matching subscriber without blocking."""
+        event = {**event, "id": next(self.sequence), "timestamp": datetime.utcnow().isoformat()}
+        self.published += 1
+        for scope in (
+            ("recruiter", event.get("recruiter_id")),
+            ("company", event.get("company_id")),
+            ("all", None),
+        ):
+            for subscription in self.subscribers.get(scope, ()):
+                subscription.deliver(event)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": sum(len(s) for s in self.subscribers.values()),
+            "published": self.published,
+        }
+
+
+progress_broker = ProgressBroker()
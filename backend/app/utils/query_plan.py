@@ -0,0 +1,34 @@
+"""Compact summaries of MongoDB explain output for debug responses."""
+from typing import Optional
+
+
+def find_stages(plan, stages: Optional[list] = None, indexes: Optional[list] = None) -> list:
+    """Collect every stage name (and, if given a list, every index name) in an explain plan tree."""
+    stages = [] if stages is None else stages
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        if indexes is not None and plan.get("indexName"):
+            indexes.append(plan["indexName"])
+        for value in plan.values():
+            find_stages(value, stages, indexes)
+    elif isinstance(plan, list):
+        for item in plan:
+            find_stages(item, stages, indexes)
+    return stages
+
+
+def summarize_explain(explain: dict) -> dict:
+    """Winning plan stages, indexes used and how much work the query did."""
+    stages, indexes = [], []
+    find_stages(explain.get("queryPlanner", {}).get("winningPlan", {}), stages, indexes)
+    stats: Optional[dict] = explain.get("executionStats")
+    summary = {"stages": stages, "indexes": indexes}
+    if stats:
+        summary.update({
+            "n_returned": stats.get("nReturned"),
+            "keys_examined": stats.get("totalKeysExamined"),
+            "docs_examined": stats.get("totalDocsExamined"),
+            "execution_ms": stats.get("executionTimeMillis"),
+        })
+    return summary
@@ -0,0 +1,117 @@
+"""
+Read-through cache for per-company dashboard responses.
+
+Each company has a version number in the `cache_versions` collection that
+every write path touching the company's job roles, candidates or
+recruiters bumps. Cached bodies are keyed by (company, version, scope), so
+a bump makes every older entry unreachable in all workers at the cost of
+one `_id` lookup per request. Responses carry a content ETag and honour
+If-None-Match with 304 Not Modified.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+import orjson
+from pymongo import UpdateOne
+
+from app.config import RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_SIZE
+from app.database import Database
+
+CACHE_VERSIONS = "cache_versions"
+
+
+class ResponseCache:
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL_SECONDS, max_size: int = RESPONSE_CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key: tuple) -> Optional[tuple]:
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[1], entry[2]
+
+    def set(self, key: tuple, etag: str, body: bytes):
+        self.entries[key] = (time.monotonic() + self.ttl, etag, body)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache()
+
+
+async def get_company_version(company_id: str) -> int:
+    document = await Database.get_collection(CACHE_VERSIONS).find_one({"_id": company_id})
+    return document["version"] if document else 0
+
+
+async def bump_company_versions(*company_ids: Optional[str]):
+    """Invalidate the cached responses of the given companies."""
+    company_ids = {c for c in company_ids if c}
+    if company_ids:
+        await Database.get_collection(CACHE_VERSIONS).bulk_write([
+            UpdateOne({"_id": company_id}, {"$inc": {"version": 1}}, upsert=True)
+            for company_id in company_ids
+        ], ordered=False)
+
+
+async def bump_all_company_versions():
+    await Database.get_collection(CACHE_VERSIONS).update_many({}, {"$inc": {"version": 1}})
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+async def cached_response(
+    request: Request,
+    company_id: str,
+    scope: str,
+    build: Callable[[], Awaitable[Any]]
+) -> Response:
+    """
+    Serve `build()` for this company and scope from the cache, building
+    and storing it on a miss. `scope` must capture everything besides the
+    company that changes the response (endpoint, role, user).
+    """
+    key = (company_id, await get_company_version(company_id), scope)
+    cached = response_cache.get(key)
+    if cached is None:
+        response_cache.misses += 1
+        body = orjson.dumps(jsonable_encoder(await build()))
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        response_cache.set(key, etag, body)
+    else:
+        response_cache.hits += 1
+        etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,321 @@
+"""
+Incrementally maintained dashboard counters.
+
+Every candidate upload, status transition and delete is recorded as a
+(before, after) pair. Its contribution is turned into `$inc` updates on:
+
+- `rollups` documents per recruiter (`recruiter:<id>`) and per company
+  (`company:<code>`), holding totals, score sums, a status histogram and
+  per-role totals;
+- the job role's `applications_count` and `shortlisted_count`;
+- the recruiter's `uploaded_cvs`, `shortlisted_candidates` (shortlisted or
+  selected) and `selected_candidates`, with `accuracy` (selected as a
+  percentage of shortlisted) recomputed in the same update so top-recruiter
+  queries can sort on an index.
+
+Each document update is atomic. `reconcile_rollups` recomputes everything
+from the candidates collection and applies the difference as `$inc`
+updates to repair drift. Both invalidate the cached
+dashboard responses of the affected companies.
+"""
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from typing import Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.database import Database
+from app.utils.response_cache import bump_company_versions, bump_all_company_versions
+from app.utils.leases import acquire_lease
+
+logger = logging.getLogger(__name__)
+
+ROLLUPS = "rollups"
+RECONCILE_LEASE = "reconcile_rollups"
+SHORTLIST_STATUSES = ("shortlisted", "selected")
+
+ACCURACY_STAGE = {"$set": {"accuracy": {"$cond": [
+    {"$gt": [{"$ifNull": ["$shortlisted_candidates", 0]}, 0]},
+    {"$round": [
+        {"$multiply": [
+            {"$divide": [{"$ifNull": ["$selected_candidates", 0]}, "$shortlisted_candidates"]},
+            100
+        ]},
+        2
+    ]},
+    0.0
+]}}}
+
+
+def _new_deltas() -> dict:
+    return {"rollups": defaultdict(Counter), "job_roles": defaultdict(Counter), "users": defaultdict(Counter)}
+
+
+def _add_contribution(
+    deltas: dict,
+    recruiter_id: Optional[str],
+    job_role_id: Optional[str],
+    company_id: Optional[str],
+    status: Optional[str],
+    count: int,
+    score_sum: float = 0,
+    score_count: int = 0
+):
+    """Add `count` candidates with the given attributes (negative to remove them)."""
+    fields = Counter({"total": count, f"status.{status or 'pending'}": count})
+    fields["score_sum"] += score_sum
+    fields["score_count"] += score_count
+    if job_role_id:
+        fields[f"roles.{job_role_id}.total"] += count
+        fields[f"roles.{job_role_id}.shortlisted"] += count if status == "shortlisted" else 0
+    if recruiter_id:
+        deltas["rollups"][f"recruiter:{recruiter_id}"].update(fields)
+    if company_id:
+        deltas["rollups"][f"company:{company_id}"].update(fields)
+    if job_role_id and ObjectId.is_valid(job_role_id):
+        deltas["job_roles"][job_role_id].update({
+            "applications_count": count,
+            "shortlisted_count": count if status == "shortlisted" else 0,
+        })
+    if recruiter_id and ObjectId.is_valid(recruiter_id):
+        deltas["users"][recruiter_id].update({
+            "uploaded_cvs": count,
+            "shortlisted_candidates": count if status in SHORTLIST_STATUSES else 0,
+            "selected_candidates": count if status == "selected" else 0,
+        })
+
+
+def _add_candidate(deltas: dict, candidate: dict, company_id: Optional[str], sign: int):
+    score = candidate.get("ats_score")
+    has_score = isinstance(score, (int, float)) and not isinstance(score, bool)
+    _add_contribution(
+        deltas,
+        candidate.get("recruiter_id"),
+        candidate.get("job_role_id"),
+        company_id,
+        candidate.get("status"),
+        sign,
+        score_sum=sign * score if has_score else 0,
+        score_count=sign if has_score else 0
+    )
+
+
+async def _company_ids(candidates: Iterable[dict]) -> dict:
+    """Map job_role_id to company id, reading job_roles only for candidates that don't carry company_id."""
+    company_ids = {}
+    missing = set()
+    for candidate in candidates:
+        job_role_id = candidate.get("job_role_id")
+        if candidate.get("company_id"):
+            company_ids[job_role_id] = candidate["company_id"]
+        elif job_role_id and ObjectId.is_valid(job_role_id):
+            missing.add(job_role_id)
+    missing -= set(company_ids)
+    if missing:
+        job_roles = await Database.get_collection("job_roles").find(
+            {"_id": {"$in": [ObjectId(i) for i in missing]}}, {"company_id": 1}
+        ).to_list(length=None)
+        company_ids.update({str(jr["_id"]): jr.get("company_id") for jr in job_roles})
+    return company_ids
+
+
+async def _apply_deltas(deltas: dict):
+    rollup_ops = []
+    for rollup_id, fields in deltas["rollups"].items():
+        fields = {k: v for k, v in fields.items() if v}
+        if fields:
+            scope, key = rollup_id.split(":", 1)
+            rollup_ops.append(UpdateOne(
+                {"_id": rollup_id},
+                {"$inc": fields, "$setOnInsert": {"scope": scope, "key": key}},
+                upsert=True
+            ))
+    for collection_name, ops in (
+        (ROLLUPS, rollup_ops),
+        ("job_roles", _counter_updates(deltas["job_roles"])),
+        ("users", _recruiter_updates(deltas["users"])),
+    ):
+        if ops:
+            await Database.get_collection(collection_name).bulk_write(ops, ordered=False)
+
+
+def _recruiter_updates(targets: dict) -> List[UpdateOne]:
+    """Pipeline updates that apply the counter deltas and then recompute accuracy from the new values."""
+    ops = []
+    for user_id, fields in targets.items():
+        fields = {k: v for k, v in fields.items() if v}
+        if fields:
+            ops.append(UpdateOne({"_id": ObjectId(user_id)}, [
+                {"$set": {k: {"$add": [{"$ifNull": [f"${k}", 0]}, v]} for k, v in fields.items()}},
+                ACCURACY_STAGE
+            ]))
+    return ops
+
+
+def _counter_updates(targets: dict) -> List[UpdateOne]:
+    ops = []
+    for target_id, fields in targets.items():
+        fields = {k: v for k, v in fields.items() if v}
+        if fields:
+            ops.append(UpdateOne({"_id": ObjectId(target_id)}, {"$inc": fields}))
+    return ops
+
+
+async def record_candidate_changes(changes: List[Tuple[Optional[dict], Optional[dict]]]):
+    """
+    Apply the counter changes for a batch of (before, after) candidate pairs.
+    Uploads pass (None, candidate), deletes (candidate, None) and status
+    transitions (old_candidate, new_candidate). Contributions are summed
+    first, so a batch costs at most one bulk write per collection.
+    """
+    if not changes:
+        return
+    company_ids = await _company_ids(c for pair in changes for c in pair if c)
+    deltas = _new_deltas()
+    for before, after in changes:
+        if before:
+            _add_candidate(deltas, before, company_ids.get(before.get("job_role_id")), -1)
+        if after:
+            _add_candidate(deltas, after, company_ids.get(after.get("job_role_id")), 1)
+    try:
+        await _apply_deltas(deltas)
+    except Exception as e:
+        # Counters are repaired by the next reconciliation; never fail the write path
+        logger.error(f"Failed to update rollups: {str(e)}")
+    try:
+        await bump_company_versions(*company_ids.values())
+    except Exception as e:
+        logger.error(f"Failed to invalidate cached responses: {str(e)}")
+
+
+async def get_rollup(scope: str, key: str) -> Optional[dict]:
+    return await Database.get_collection(ROLLUPS).find_one({"_id": f"{scope}:{key}"})
+
+
+def summarize_rollup(rollup: dict) -> dict:
+    """Turn a rollup document into the numbers the dashboards show."""
+    statuses = rollup.get("status", {})
+    score_count = rollup.get("score_count", 0)
+    roles = {
+        role_id: {"total": counts.get("total", 0), "shortlisted": counts.get("shortlisted", 0)}
+        for role_id, counts in rollup.get("roles", {}).items()
+        if counts.get("total", 0) > 0
+    }
+    return {
+        "total": rollup.get("total", 0),
+        "avg_score": round(rollup.get("score_sum", 0) / score_count, 1) if score_count else 0,
+        "rejected": statuses.get("rejected", 0),
+        "shortlisted": statuses.get("shortlisted", 0),
+        "roles": roles,
+    }
+
+
+def _flatten(document: dict, prefix: str = "") -> Counter:
+    """Numeric fields of a rollup document as a Counter keyed by dotted path."""
+    fields = Counter()
+    for name, value in document.items():
+        if not prefix and name in ("_id", "scope", "key"):
+            continue
+        if isinstance(value, dict):
+            fields.update(_flatten(value, f"{prefix}{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            fields[f"{prefix}{name}"] += value
+    return fields
+
+
+async def _snapshot_counters() -> dict:
+    """Current rollups and counters, shaped like the deltas reconciliation computes."""
+    snapshot = _new_deltas()
+    async for rollup in Database.get_collection(ROLLUPS).find({}):
+        snapshot["rollups"][rollup["_id"]] = _flatten(rollup)
+    async for job_role in Database.get_collection("job_roles").find(
+        {}, {"applications_count": 1, "shortlisted_count": 1}
+    ):
+        snapshot["job_roles"][str(job_role["_id"])] = Counter({
+            "applications_count": job_role.get("applications_count", 0),
+            "shortlisted_count": job_role.get("shortlisted_count", 0),
+        })
+    async for user in Database.get_collection("users").find(
+        {"$or": [{"role": "recruiter"}, {"uploaded_cvs": {"$exists": True}}]},
+        {"uploaded_cvs": 1, "shortlisted_candidates": 1, "selected_candidates": 1}
+    ):
+        snapshot["users"][str(user["_id"])] = Counter({
+            "uploaded_cvs": user.get("uploaded_cvs", 0),
+            "shortlisted_candidates": user.get("shortlisted_candidates", 0),
+            "selected_candidates": user.get("selected_candidates", 0),
+        })
+    return snapshot
+
+
+async def reconcile_rollups() -> dict:
+    """
+    Recompute every rollup and counter from the candidates collection and
+    apply the difference from a snapshot taken just before, as `$inc`
+    updates. Changes recorded by the write path while this runs are kept,
+    instead of being overwritten by values computed before they happened;
+    only changes landing during the aggregation itself can be counted
+    twice or missed, and the next run corrects them.
+    """
+    candidates = Database.get_collection("candidates")
+    job_roles = await Database.get_collection("job_roles").find({}, {"company_id": 1}).to_list(length=None)
+    role_companies = {str(jr["_id"]): jr.get("company_id") for jr in job_roles}
+
+    snapshot = await _snapshot_counters()
+    pipeline = [
+        {"$group": {
+            "_id": {"recruiter_id": "$recruiter_id", "job_role_id": "$job_role_id", "status": "$status"},
+            "count": {"$sum": 1},
+            "score_sum": {"$sum": {"$cond": [{"$isNumber": "$ats_score"}, "$ats_score", 0]}},
+            "score_count": {"$sum": {"$cond": [{"$isNumber": "$ats_score"}, 1, 0]}},
+        }}
+    ]
+    corrections = _new_deltas()
+    async for group in candidates.aggregate(pipeline, allowDiskUse=True):
+        key = group["_id"]
+        job_role_id = key.get("job_role_id")
+        _add_contribution(
+            corrections,
+            key.get("recruiter_id"),
+            job_role_id,
+            role_companies.get(job_role_id),
+            key.get("status"),
+            group["count"],
+            score_sum=group["score_sum"],
+            score_count=group["score_count"]
+        )
+    for target, counters in snapshot.items():
+        for target_id, fields in counters.items():
+            corrections[target][target_id].subtract(fields)
+
+    await _apply_deltas(corrections)
+    await bump_all_company_versions()
+
+    summary = {
+        target: sum(1 for fields in targets.values() if any(fields.values()))
+        for target, targets in corrections.items()
+    }
+    logger.info(f"Reconciled rollups, corrected: {summary}")
+    return summary
+
+
+async def reconcile_rollups_periodically(interval: float):
+    """
+    Background loop that repairs drift; runs immediately if no rollups exist
+    yet. Every worker runs the loop, but the lease is held for the whole
+    interval, so reconciliation runs in one worker per interval.
+    """
+    if await Database.get_collection(ROLLUPS).estimated_document_count() == 0:
+        await _safe_reconcile(interval)
+    while True:
+        await asyncio.sleep(interval)
+        await _safe_reconcile(interval)
+
+
+async def _safe_reconcile(interval: float):
+    try:
+        if await acquire_lease(RECONCILE_LEASE, interval):
+            await reconcile_rollups()
+    except Exception as e:
+        logger.error(f"Rollup reconciliation failed: {str(e)}")
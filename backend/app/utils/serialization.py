@@ -0,0 +1,50 @@
+"""
+Fast JSON responses for documents read from our own database.
+
+Candidate documents were validated when we wrote them, so list endpoints
+shape them to the response model's fields without re-validating every
+value (and re-parsing every URL), then serialize with orjson. Endpoints
+keep their `response_model` for the OpenAPI schema; returning a Response
+directly skips FastAPI's second validation pass.
+"""
+from functools import lru_cache
+from typing import Iterable, List, Optional, Type
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+@lru_cache(maxsize=None)
+def _model_fields(model: Type[BaseModel]) -> tuple:
+    return tuple(
+        (name, field.get_default(call_default_factory=True))
+        for name, field in model.model_fields.items()
+    )
+
+
+def trusted_dump(document: dict, model: Type[BaseModel]) -> dict:
+    """Shape a stored document like `model(**document).model_dump()` would, without validation."""
+    dumped = {}
+    for name, default in _model_fields(model):
+        if name == "id" and "_id" in document:
+            dumped[name] = str(document["_id"])
+        else:
+            dumped[name] = document.get(name, default)
+    return dumped
+
+
+def trusted_dump_many(documents: Iterable[dict], model: Type[BaseModel]) -> List[dict]:
+    return [trusted_dump(document, model) for document in documents]
+
+
+def trusted_list_response(documents: Iterable[dict], model: Type[BaseModel]) -> ORJSONResponse:
+    return ORJSONResponse(trusted_dump_many(documents, model))
+
+
+def trusted_page_response(
+    documents: Iterable[dict],
+    model: Type[BaseModel],
+    next_cursor: Optional[str],
+    **extra
+) -> ORJSONResponse:
+    return ORJSONResponse({"items": trusted_dump_many(documents, model), "next_cursor": next_cursor, **extra})
@@ -0,0 +1,47 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight task.
+    The shared task is detached from its callers: a caller that is
+    cancelled stops waiting, but the work carries on for everyone else.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., Awaitable[Any]],
+        *args,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Run fn(*args) or join the call already running for key, waiting at most `timeout` seconds."""
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args))
+            self.calls[key] = task
+            self.started += 1
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        if self.calls.get(key) is task:
+            del self.calls[key]
+        # Retrieve the exception so it isn't reported when every caller gave up
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "in_flight": len(self.calls),
+        }
@@ -0,0 +1,150 @@
+"""
+Where uploaded CV files are kept.
+
+CV_STORAGE_BACKEND selects Cloudinary (the default) or a local,
+content-addressed directory that stands in for it offline and in
+benchmarks. Both backends do their blocking work in the thread pool.
+Cloudinary credentials are checked on first upload, not at import, so the
+API starts without them.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.config import (
+    CLOUDINARY_CLOUD_NAME,
+    CLOUDINARY_API_KEY,
+    CLOUDINARY_API_SECRET,
+    CV_STORAGE_BACKEND,
+    LOCAL_STORAGE_DIR,
+    LOCAL_STORAGE_BASE_URL,
+    MAX_UPLOAD_BYTES,
+    UPLOAD_CHUNK_BYTES
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StorageError(Exception):
+    pass
+
+
+class CloudinaryStorage:
+    name = "cloudinary"
+
+    def __init__(self):
+        self.configured = False
+
+    def _configure(self):
+        if self.configured:
+            return
+        if not all([CLOUDINARY_CLOUD_NAME, CLOUDINARY_API_KEY, CLOUDINARY_API_SECRET]):
+            raise StorageError("Missing Cloudinary credentials. Please check your .env file.")
+        import cloudinary
+        cloudinary.config(
+            cloud_name=CLOUDINARY_CLOUD_NAME,
+            api_key=CLOUDINARY_API_KEY,
+            api_secret=CLOUDINARY_API_SECRET
+        )
+        self.configured = True
+
+    async def save(self, content: bytes, filename: str, content_hash: str, timeout: Optional[float] = None) -> str:
+        self._configure()
+        import cloudinary.uploader
+        stem = filename.rsplit('/', 1)[-1].split('.')[0]
+        result = await run_in_threadpool(
+            cloudinary.uploader.upload,
+            content,
+            resource_type="raw",  # Use raw for all document types
+            folder="cv_uploads",
+            type="upload",
+            public_id=f"{stem}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}",
+            format=filename.split('.')[-1].lower(),  # Preserve original format
+            timeout=timeout
+        )
+        return result["secure_url"]
+
+
+class LocalStorage:
+    """Files named by their SHA-256 under root/ab/cd/, so identical CVs are stored once."""
+    name = "local"
+
+    def __init__(self, root: str = LOCAL_STORAGE_DIR, base_url: str = LOCAL_STORAGE_BASE_URL):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def relative_path(self, content_hash: str, filename: str) -> str:
+        extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else "bin"
+        return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}.{extension}"
+
+    def _write(self, path: str, content: bytes):
+        if os.path.exists(path):
+            return
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    async def save(self, content: bytes, filename: str, content_hash: str, timeout: Optional[float] = None) -> str:
+        relative = self.relative_path(content_hash, filename)
+        await run_in_threadpool(self._write, os.path.join(self.root, relative), content)
+        return f"{self.base_url}/{relative}"
+
+
+def create_storage(backend: str = CV_STORAGE_BACKEND):
+    if backend == "cloudinary":
+        return CloudinaryStorage()
+    if backend == "local":
+        return LocalStorage()
+    raise ValueError(f"Unknown CV_STORAGE_BACKEND: {backend}")
+
+
+cv_storage = create_storage()
+
+
+def read_limited(file, max_bytes: int = MAX_UPLOAD_BYTES, chunk_size: int = UPLOAD_CHUNK_BYTES) -> Tuple[bytes, str]:
+    """
+    Blocking chunked read of a file object, returning (content, sha256).
+    Raises 413 as soon as the content exceeds max_bytes.
+    """
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"File exceeds the upload limit of {max_bytes} bytes")
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), digest.hexdigest()
+
+
+async def read_upload(
+    file: UploadFile,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_BYTES
+) -> Tuple[bytes, str]:
+    """
+    Read an upload in chunks in the thread pool, hashing as it goes, and
+    return (content, sha256). Stops with 413 as soon as the file exceeds
+    max_bytes instead of reading the rest.
+    """
+    await file.seek(0)
+    return await run_in_threadpool(read_limited, file.file, max_bytes, chunk_size)
@@ -0,0 +1 @@
+"""Benchmarks for the CV Align backend. Run from backend/ with `python -m benchmarks.<name>`."""
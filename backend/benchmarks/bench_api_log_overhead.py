@@ -0,0 +1,76 @@
+"""
+Per-request overhead of API logging, in microseconds.
+
+Requests are driven straight through the ASGI stack against a trivial
+endpoint, so the numbers isolate the middleware. "buffered" is the
+APILogMiddleware with the in-memory writer; "awaited insert" writes one
+document per request before responding like the previous middleware
+(needs MongoDB, skipped with BENCH_SKIP_DB=1).
+"""
+import asyncio
+import os
+import time
+
+from benchmarks.common import connect_bench_db, percentile
+from app.database import Database
+from app.utils.api_log import APILogMiddleware, ApiLogWriter
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "20000"))
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+class AwaitedInsertMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        start = time.perf_counter()
+        await self.app(scope, receive, send)
+        await Database.get_collection("api_logs").insert_one({
+            "path": scope["path"], "method": scope["method"], "duration": time.perf_counter() - start
+        })
+
+
+async def drive(app, requests=REQUESTS):
+    scope = {"type": "http", "path": "/bench", "method": "GET", "headers": []}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await app(dict(scope), receive, send)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name, timings, baseline):
+    overhead = [(t - baseline) * 1e6 for t in timings]
+    print(f"{name:<16} {percentile(overhead, 50):>10.1f} {percentile(overhead, 99):>10.1f}")
+
+
+async def main():
+    baseline = percentile(await drive(endpoint), 50)
+    writer = ApiLogWriter(batch_size=REQUESTS + 1, max_buffer=REQUESTS + 1)
+    print(f"{REQUESTS} requests, overhead over a bare endpoint")
+    print(f"{'logging':<16} {'p50 us':>10} {'p99 us':>10}")
+    report("buffered", await drive(APILogMiddleware(endpoint, writer)), baseline)
+    if os.getenv("BENCH_SKIP_DB") != "1":
+        await connect_bench_db()
+        report("awaited insert", await drive(AwaitedInsertMiddleware(endpoint), REQUESTS // 10), baseline)
+        start = time.perf_counter()
+        await writer.stop()
+        print(f"flushed {writer.written} buffered entries in {time.perf_counter() - start:.2f}s")
+        await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
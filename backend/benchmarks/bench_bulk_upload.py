@@ -0,0 +1,78 @@
+"""
+Throughput of the bulk upload pipeline for a zip archive of 500 CVs.
+
+Storage and AI calls are replaced with fixed-latency stand-ins so the numbers
+reflect pipeline overhead and concurrency, not Cloudinary or Groq. Candidate
+inserts and counter updates go to a real MongoDB (MONGODB_URL).
+"""
+import asyncio
+import io
+import json
+import os
+import zipfile
+
+from benchmarks.common import connect_bench_db, bench_user, Timer
+from starlette.datastructures import Headers, UploadFile
+from app.database import Database
+from app.routes import candidate
+
+CV_COUNT = int(os.getenv("BENCH_CV_COUNT", "500"))
+STORAGE_LATENCY = float(os.getenv("BENCH_STORAGE_LATENCY", "0.05"))
+AI_LATENCY = float(os.getenv("BENCH_AI_LATENCY", "0.2"))
+
+
+async def fake_store_cv_file(file_content, filename, content_hash, deadline=None):
+    await asyncio.sleep(STORAGE_LATENCY)
+    return f"https://storage.example.com/{filename}"
+
+
+async def fake_parse_cv_with_ai(cv_content, job_description, deadline=None):
+    await asyncio.sleep(AI_LATENCY)
+    return {"candidate_name": "Bench Candidate", "ats_score": 70, "strengths": [], "weaknesses": []}
+
+
+def build_archive() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for i in range(CV_COUNT):
+            archive.writestr(f"cvs/candidate_{i}.pdf", b"%PDF-1.4\n" + os.urandom(20 * 1024))
+    return buffer.getvalue()
+
+
+async def run(concurrency: int, archive_bytes: bytes, job_role: dict):
+    upload = UploadFile(
+        io.BytesIO(archive_bytes),
+        filename="cvs.zip",
+        headers=Headers({"content-type": "application/zip"})
+    )
+    last_line = None
+    with Timer() as timer:
+        async for line in candidate.bulk_upload_stream(
+            [upload], job_role, "Bench JD", bench_user(), concurrency=concurrency
+        ):
+            last_line = line
+    return timer.elapsed, json.loads(last_line)["summary"]
+
+
+async def main():
+    db = await connect_bench_db()
+    candidate.store_cv_file = fake_store_cv_file
+    candidate.parse_cv_with_ai = fake_parse_cv_with_ai
+    archive_bytes = build_archive()
+
+    print(f"{CV_COUNT} CVs, storage {STORAGE_LATENCY * 1000:.0f} ms, AI {AI_LATENCY * 1000:.0f} ms")
+    print(f"{'concurrency':>12} {'seconds':>10} {'CVs/s':>10} {'failed':>8} {'analyzed':>9}")
+    for concurrency in (1, 4, 8, 16, 32):
+        result = await db.job_roles.insert_one({"title": f"Bench {concurrency}", "company_id": "BENCH", "applications_count": 0})
+        job_role = await db.job_roles.find_one({"_id": result.inserted_id})
+        elapsed, summary = await run(concurrency, archive_bytes, job_role)
+        # A stand-in that raises is swallowed into a "Pending AI Analysis" candidate, so count real analyses
+        analyzed = await db.candidates.count_documents(
+            {"job_role_id": str(job_role["_id"]), "candidate_name": "Bench Candidate"}
+        )
+        print(f"{concurrency:>12} {elapsed:>10.2f} {CV_COUNT / elapsed:>10.1f} {summary['failed']:>8} {analyzed:>9}")
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""
+Latency of GET /candidates/search over a large candidate collection.
+
+Candidates are seeded with strengths, weaknesses and feedback drawn from a
+small vocabulary so common terms match a large share of the collection and
+rare terms only a few rows. Each query is timed for the first page and for
+the page behind its cursor, as a hiring manager (company scope) and as an
+admin. Set BENCH_SEARCH_SIZE to change the collection size (default 1M).
+"""
+import asyncio
+import os
+import random
+from datetime import datetime
+
+from benchmarks.common import connect_bench_db, bench_user, percentile, Timer
+from app.database import Database
+from app.routes.candidate import search_candidates
+
+SIZE = int(os.getenv("BENCH_SEARCH_SIZE", "1000000"))
+RUNS = int(os.getenv("BENCH_SEARCH_RUNS", "50"))
+COMPANIES = 20
+SKILLS = ["Python", "Java", "SQL", "Kubernetes", "React", "Go", "Rust", "Terraform", "Spark", "Kafka"]
+GAPS = ["public speaking", "documentation", "testing", "system design", "time management"]
+DEGREES = ["B.Tech", "M.Tech", "B.Sc", "MBA", "PhD"]
+COURSES = ["Computer Science", "Electronics", "Mathematics", "Data Science", "Mechanical"]
+QUERIES = ["python", "kubernetes kafka", "\"system design\"", "rust -java", "phd mathematics"]
+
+
+async def seed(db, count):
+    batch = []
+    for i in range(count):
+        # Skew the vocabulary so the first skills are common and the last ones rare
+        strengths = random.sample(SKILLS[:3], 2) + [random.choices(SKILLS, weights=range(10, 0, -1))[0]]
+        batch.append({
+            "candidate_name": f"Candidate {i}",
+            "degree": random.choice(DEGREES),
+            "course": random.choice(COURSES),
+            "cgpa": "8.1",
+            "ats_score": random.randint(0, 100),
+            "strengths": strengths,
+            "weaknesses": random.sample(GAPS, 2),
+            "feedback": f"Solid {strengths[-1]} experience, needs work on {random.choice(GAPS)}.",
+            "recruiter_id": f"recruiter-{i % 100}",
+            "job_role_id": f"role-{i % 50}",
+            "job_role_title": "Backend Engineer",
+            "company_id": f"BENCH-{i % COMPANIES}",
+            "status": "pending",
+            "created_at": datetime.utcnow(),
+        })
+        if len(batch) == 10000:
+            await db.candidates.insert_many(batch)
+            batch = []
+    if batch:
+        await db.candidates.insert_many(batch)
+
+
+async def time_query(user, q):
+    first, second = [], []
+    for _ in range(RUNS):
+        with Timer() as timer:
+            page = await search_candidates(q=q, job_role_id=None, cursor=None, limit=20, current_user=user)
+        first.append(timer.elapsed * 1000)
+        cursor = _next_cursor(page)
+        if cursor:
+            with Timer() as timer:
+                await search_candidates(q=q, job_role_id=None, cursor=cursor, limit=20, current_user=user)
+            second.append(timer.elapsed * 1000)
+    return first, second
+
+
+def _next_cursor(response):
+    import orjson
+    return orjson.loads(response.body)["next_cursor"]
+
+
+async def main():
+    db = await connect_bench_db()
+    with Timer() as timer:
+        await seed(db, SIZE)
+    print(f"seeded {SIZE} candidates in {timer.elapsed:.1f}s")
+    users = {"hiring_manager": bench_user(role="hiring_manager", company_code="BENCH-0"), "admin": bench_user(role="admin")}
+    print(f"{'scope':<15} {'query':<20} {'page':<6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for scope, user in users.items():
+        for q in QUERIES:
+            first, second = await time_query(user, q)
+            for label, samples in (("first", first), ("next", second)):
+                if samples:
+                    print(
+                        f"{scope:<15} {q:<20} {label:<6} {percentile(samples, 50):>8.1f} "
+                        f"{percentile(samples, 95):>8.1f} {percentile(samples, 99):>8.1f}"
+                    )
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
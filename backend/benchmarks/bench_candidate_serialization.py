@@ -0,0 +1,99 @@
+"""
+Serializing 10k candidates for a list endpoint.
+
+"per-item models" is the previous path: CandidateResponse(**doc) per
+document, then FastAPI validates and serializes the list again through
+response_model and JSONResponse. "TypeAdapter" validates the batch at once
+and dumps JSON in pydantic-core. "trusted + orjson" is the path the list
+endpoints now take. Time is the median of a few runs; peak memory comes
+from tracemalloc.
+"""
+import asyncio
+import os
+import statistics
+import tracemalloc
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+from benchmarks.common import Timer
+from app.models.candidate import CandidateResponse
+from app.utils.mongo_utils import convert_id
+from app.utils.serialization import trusted_list_response
+
+CANDIDATES = int(os.getenv("BENCH_CANDIDATES", "10000"))
+RUNS = int(os.getenv("BENCH_RUNS", "5"))
+
+
+def documents():
+    return [
+        {
+            "_id": ObjectId(),
+            "candidate_name": f"Candidate {i}",
+            "degree": "B.Tech",
+            "course": "Computer Science",
+            "cgpa": "8.4",
+            "ats_score": i % 100,
+            "strengths": ["Python", "Distributed systems", "Communication"],
+            "weaknesses": ["Limited frontend experience"],
+            "feedback": "Solid backend profile. " * 5,
+            "detailed_feedback": "Detailed feedback paragraph. " * 40,
+            "cv_url": f"https://res.cloudinary.com/demo/raw/upload/v1/cv_uploads/cv_{i}.pdf",
+            "recruiter_id": "recruiter-1",
+            "job_role_id": "role-1",
+            "job_role_title": "Backend Engineer",
+            "company_id": "BENCH",
+            "status": "pending",
+            "content_hash": "0" * 64,
+            "created_at": datetime.utcnow(),
+        }
+        for i in range(CANDIDATES)
+    ]
+
+
+async def per_item_models(docs):
+    field = create_response_field("response", List[CandidateResponse])
+    models = [CandidateResponse(**convert_id(dict(d))) for d in docs]
+    content = await serialize_response(field=field, response_content=models)
+    return JSONResponse(content).body
+
+
+async def type_adapter(docs, adapter=TypeAdapter(List[CandidateResponse])):
+    return adapter.dump_json(adapter.validate_python([convert_id(dict(d)) for d in docs]))
+
+
+async def trusted(docs):
+    return trusted_list_response(docs, CandidateResponse).body
+
+
+async def measure(fn, docs):
+    timings = []
+    for _ in range(RUNS):
+        with Timer() as timer:
+            await fn(docs)
+        timings.append(timer.elapsed)
+    tracemalloc.start()
+    body = await fn(docs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings) * 1000, peak / 1024 / 1024, len(body)
+
+
+async def main():
+    docs = documents()
+    print(f"{CANDIDATES} candidates")
+    print(f"{'path':<18} {'ms':>8} {'peak MiB':>9} {'speedup':>8} {'body KiB':>9}")
+    baseline = None
+    for name, fn in [("per-item models", per_item_models), ("TypeAdapter", type_adapter), ("trusted + orjson", trusted)]:
+        elapsed, peak, size = await measure(fn, docs)
+        baseline = baseline or elapsed
+        print(f"{name:<18} {elapsed:>8.1f} {peak:>9.1f} {baseline / elapsed:>7.1f}x {size / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+MongoDB commands per hiring-manager dashboard load, with and without the response cache.
+
+A dashboard load calls the five endpoints the frontend polls. "cold" builds
+every response, "warm" serves them from the cache and "revalidate" sends
+the ETags back and gets 304s. After a candidate status change only the
+affected company's entries are rebuilt.
+"""
+import asyncio
+import random
+from datetime import datetime
+
+from bson import ObjectId
+from starlette.requests import Request
+from benchmarks.common import connect_bench_db, bench_user, command_counter, Timer
+from app.database import Database
+from app.routes.job_role import get_job_roles, get_top_job_roles, get_metrics
+from app.routes.users import get_all_recruiters, get_top_recruiters
+from app.utils.response_cache import response_cache, bump_company_versions
+
+ENDPOINTS = [get_job_roles, get_top_job_roles, get_metrics, get_all_recruiters, get_top_recruiters]
+
+
+async def seed(db):
+    roles = [{"_id": ObjectId(), "title": f"Role {i}", "company_id": "BENCH", "applications_count": 0} for i in range(20)]
+    await db.job_roles.insert_many(roles)
+    recruiters = [
+        {"email": f"r{i}@bench.example.com", "full_name": f"Recruiter {i}", "company_code": "BENCH", "role": "recruiter"}
+        for i in range(10)
+    ]
+    await db.users.insert_many(recruiters)
+    await db.candidates.insert_many([
+        {
+            "candidate_name": f"Candidate {i}",
+            "recruiter_id": str(recruiters[i % 10]["_id"]),
+            "job_role_id": str(roles[i % 20]["_id"]),
+            "job_role_title": roles[i % 20]["title"],
+            "company_id": "BENCH",
+            "ats_score": random.randint(0, 100),
+            "status": "pending",
+            "created_at": datetime.utcnow(),
+        }
+        for i in range(5000)
+    ])
+
+
+def request(etags=None):
+    headers = [(b"if-none-match", etags.encode())] if etags else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+async def dashboard_load(user, etags=None):
+    command_counter.reset()
+    with Timer() as timer:
+        responses = [await endpoint(request=request(etags and etags[i]), current_user=user) for i, endpoint in enumerate(ENDPOINTS)]
+    return command_counter.queries, timer.elapsed * 1000, responses
+
+
+async def main():
+    db = await connect_bench_db()
+    await seed(db)
+    user = bench_user(role="hiring_manager")
+
+    print(f"{'load':<12} {'mongo ops':>9} {'ms':>8} {'statuses':>24}")
+    for name in ["cold", "warm", "revalidate", "after write"]:
+        if name == "after write":
+            await bump_company_versions("BENCH")
+        etags = [r.headers["etag"] for r in responses] if name == "revalidate" else None
+        ops, elapsed, responses = await dashboard_load(user, etags)
+        statuses = ",".join(str(r.status_code) for r in responses)
+        print(f"{name:<12} {ops:>9} {elapsed:>8.2f} {statuses:>24}")
+    print(response_cache.stats())
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""
+Peak Python memory of GET /candidates/export at different export sizes.
+
+Each size is seeded into the benchmark database for one company, then the
+CSV and NDJSON exports are consumed chunk by chunk the way the ASGI server
+would. Peak memory should stay flat as the row count grows. Set
+BENCH_EXPORT_SIZES to change the sizes (seeding 1M rows takes a few minutes).
+"""
+import asyncio
+import os
+import random
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.common import connect_bench_db, bench_user, Timer
+from app.database import Database
+from app.routes.candidate import export_candidates
+
+SIZES = [int(s) for s in os.getenv("BENCH_EXPORT_SIZES", "100,10000,1000000").split(",")]
+
+
+async def seed(db, count, company_id):
+    batch = []
+    for i in range(count):
+        batch.append({
+            "candidate_name": f"Candidate {i}",
+            "degree": "B.Tech",
+            "course": "Computer Science",
+            "cgpa": "8.1",
+            "ats_score": random.randint(0, 100),
+            "strengths": ["Python", "SQL"],
+            "weaknesses": ["Public speaking"],
+            "feedback": "x" * 200,
+            "detailed_feedback": "y" * 1200,
+            "recruiter_id": "recruiter-1",
+            "job_role_id": "role-1",
+            "job_role_title": "Backend Engineer",
+            "company_id": company_id,
+            "status": "pending",
+            "created_at": datetime.utcnow(),
+        })
+        if len(batch) == 10000:
+            await db.candidates.insert_many(batch)
+            batch = []
+    if batch:
+        await db.candidates.insert_many(batch)
+
+
+async def consume(response):
+    size = 0
+    async for chunk in response.body_iterator:
+        size += len(chunk)
+    return size
+
+
+async def main():
+    db = await connect_bench_db()
+    print(f"{'rows':>9} {'format':<7} {'seconds':>8} {'MiB out':>8} {'peak MiB':>9}")
+    for count in SIZES:
+        company_id = f"BENCH-{count}"
+        await seed(db, count, company_id)
+        user = bench_user(role="hiring_manager", company_code=company_id)
+        for fmt in ("csv", "ndjson"):
+            response = await export_candidates(
+                format=fmt, columns=None, job_role_id=None, status=None, min_score=None, max_score=None,
+                degree=None, created_from=None, created_to=None, current_user=user
+            )
+            tracemalloc.start()
+            with Timer() as timer:
+                size = await consume(response)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{count:>9} {fmt:<7} {timer.elapsed:>8.2f} {size / 1024 / 1024:>8.1f} {peak / 1024 / 1024:>9.2f}")
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Latency of an unrelated endpoint while a burst of logins is verified.
+
+A probe calls GET /auth/me's handler every few milliseconds and records how
+late it completes, i.e. the event-loop stall it sees. "inline" verifies
+bcrypt on the event loop like the previous implementation; "executor"
+uses the bounded password executor. Needs a MongoDB for the user lookup.
+"""
+import asyncio
+import os
+import time
+from unittest import mock
+
+from fastapi.security import OAuth2PasswordRequestForm
+from benchmarks.common import connect_bench_db, bench_user, percentile
+from app.database import Database
+from app.auth.utils import pwd_context
+from app.routes import auth
+
+LOGINS = int(os.getenv("BENCH_LOGINS", "100"))
+CONCURRENCY = int(os.getenv("BENCH_LOGIN_CONCURRENCY", "20"))
+PROBE_INTERVAL = 0.005
+PASSWORD = "bench-password"
+
+
+async def verify_inline(plain_password, hashed_password):
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def login_storm():
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def login(i):
+        async with semaphore:
+            form = OAuth2PasswordRequestForm(username=f"user{i % 10}@bench.example.com", password=PASSWORD)
+            await auth.login(form)
+
+    await asyncio.gather(*(login(i) for i in range(LOGINS)))
+
+
+async def probe(latencies, stop):
+    user = bench_user()
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        await auth.read_users_me(current_user=user)
+        latencies.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def run(name):
+    latencies = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(latencies, stop))
+    start = time.perf_counter()
+    await login_storm()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await prober
+    print(
+        f"{name:<9} {LOGINS / elapsed:>9.1f} "
+        f"{percentile(latencies, 50) * 1000:>9.2f} {percentile(latencies, 99) * 1000:>9.2f} "
+        f"{max(latencies) * 1000:>9.2f}"
+    )
+
+
+async def main():
+    db = await connect_bench_db()
+    hashed_password = pwd_context.hash(PASSWORD)
+    await db.users.insert_many([
+        {
+            "email": f"user{i}@bench.example.com",
+            "full_name": f"User {i}",
+            "company_code": "BENCH",
+            "role": "recruiter",
+            "hashed_password": hashed_password,
+            "is_active": True,
+        }
+        for i in range(10)
+    ])
+    print(f"{LOGINS} logins, {CONCURRENCY} concurrent, bcrypt rounds {pwd_context.to_dict()['bcrypt__rounds']}")
+    print(f"{'mode':<9} {'logins/s':>9} {'probe p50':>9} {'probe p99':>9} {'max ms':>9}")
+    with mock.patch.object(auth, "verify_and_update_password", verify_inline):
+        await run("inline")
+    await run("executor")
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""
+GET /job-roles/metrics/ for a hiring manager and a recruiter over 1M synthetic candidates.
+
+"before" is the previous implementation (load every candidate, count in
+Python); "after" is the aggregation pipeline. Peak Python memory is
+measured with tracemalloc. Seeding 1M documents takes a few minutes;
+set BENCH_CANDIDATES to try smaller sizes and BENCH_SKIP_SEED=1 to reuse data.
+"""
+import asyncio
+import os
+import random
+import tracemalloc
+from datetime import datetime
+
+from bson import ObjectId
+from benchmarks.common import connect_bench_db, bench_user, Timer
+from app.database import Database
+from app.routes.job_role import compute_metrics
+
+CANDIDATES = int(os.getenv("BENCH_CANDIDATES", "1000000"))
+ROLES = 50
+RECRUITERS = 10
+STATUSES = ["pending", "rejected", "shortlisted", "selected"]
+
+
+async def seed(db):
+    roles = [{"_id": ObjectId(), "title": f"Role {i}", "company_id": "BENCH"} for i in range(ROLES)]
+    await db.job_roles.insert_many(roles)
+    batch = []
+    for i in range(CANDIDATES):
+        role = roles[i % ROLES]
+        batch.append({
+            "candidate_name": f"Candidate {i}",
+            "recruiter_id": f"recruiter-{i % RECRUITERS}",
+            "job_role_id": str(role["_id"]),
+            "job_role_title": role["title"],
+            "company_id": role["company_id"],
+            "ats_score": random.randint(0, 100),
+            "status": random.choice(STATUSES),
+            "feedback": "x" * 200,
+            "detailed_feedback": "y" * 1200,
+            "created_at": datetime.utcnow(),
+        })
+        if len(batch) == 10000:
+            await db.candidates.insert_many(batch)
+            batch = []
+    if batch:
+        await db.candidates.insert_many(batch)
+
+
+async def python_metrics(match: dict, job_roles: list):
+    """The previous approach: materialize every candidate and loop over roles x candidates."""
+    candidates = await Database.get_collection("candidates").find(match).to_list(length=None)
+    role_counts = {}
+    for candidate in candidates:
+        role = candidate.get("job_role_title", "Unknown")
+        role_counts[role] = role_counts.get(role, 0) + 1
+    valid_scores = [c.get("ats_score", 0) for c in candidates if c.get("ats_score") is not None]
+    shortlist_rates = {}
+    for job_role in job_roles:
+        role_candidates = [c for c in candidates if c.get("job_role_id") == str(job_role["_id"])]
+        if role_candidates:
+            shortlisted = len([c for c in role_candidates if c.get("status") == "shortlisted"])
+            shortlist_rates[job_role["title"]] = shortlisted / len(role_candidates)
+    return max(role_counts.items(), key=lambda x: x[1])[0], sum(valid_scores) / len(valid_scores), shortlist_rates
+
+
+async def measure(coroutine_factory):
+    tracemalloc.start()
+    with Timer() as timer:
+        await coroutine_factory()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timer.elapsed, peak / 1024 / 1024
+
+
+async def main():
+    skip_seed = os.getenv("BENCH_SKIP_SEED") == "1"
+    db = await connect_bench_db(drop=not skip_seed)
+    if not skip_seed:
+        await seed(db)
+    job_roles = await db.job_roles.find({"company_id": "BENCH"}).to_list(length=None)
+    hiring_manager = bench_user(role="hiring_manager")
+    recruiter = bench_user(user_id="recruiter-0")
+
+    cases = [
+        ("hiring manager", {"job_role_id": {"$in": [str(r["_id"]) for r in job_roles]}}, hiring_manager),
+        ("recruiter", {"recruiter_id": recruiter.id}, recruiter),
+    ]
+    print(f"{CANDIDATES} candidates, {ROLES} roles")
+    print(f"{'scope':<16} {'before s':>9} {'before MiB':>11} {'after s':>9} {'after MiB':>10}")
+    for name, match, user in cases:
+        before = await measure(lambda: python_metrics(match, job_roles))
+        after = await measure(lambda: compute_metrics(user))
+        print(f"{name:<16} {before[0]:>9.2f} {before[1]:>11.1f} {after[0]:>9.2f} {after[1]:>10.2f}")
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+Fan-out cost of the progress broker with 1,000 concurrent SSE subscribers.
+
+Half of the subscribers share one company scope and receive every event;
+the rest are recruiters who only see their own. A tenth of the consumers
+are deliberately slow to show that their buffers stay bounded.
+"""
+import asyncio
+import os
+import time
+import tracemalloc
+
+from app.utils.progress import ProgressBroker
+from benchmarks.common import percentile
+
+SUBSCRIBERS = int(os.getenv("BENCH_SUBSCRIBERS", "1000"))
+EVENTS = int(os.getenv("BENCH_EVENTS", "2000"))
+BUFFER_SIZE = int(os.getenv("BENCH_BUFFER_SIZE", "100"))
+
+
+async def consume(subscription, latencies, slow):
+    while True:
+        event = await subscription.queue.get()
+        if event is None:
+            return
+        latencies.append(time.perf_counter() - event["sent_at"])
+        if slow:
+            await asyncio.sleep(0.01)
+
+
+async def main():
+    broker = ProgressBroker(buffer_size=BUFFER_SIZE)
+    latencies = []
+    subscriptions = []
+    consumers = []
+    tracemalloc.start()
+    for i in range(SUBSCRIBERS):
+        if i % 2:
+            subscription = broker.subscribe("recruiter", f"recruiter-{i}")
+        else:
+            subscription = broker.subscribe("company", "company-1")
+        subscriptions.append(subscription)
+        consumers.append(asyncio.create_task(consume(subscription, latencies, slow=i % 10 == 0)))
+
+    publish_times = []
+    for i in range(EVENTS):
+        start = time.perf_counter()
+        broker.publish({
+            "stage": "done",
+            "recruiter_id": f"recruiter-{(i * 2 + 1) % SUBSCRIBERS}",
+            "company_id": "company-1",
+            "sent_at": start,
+        })
+        publish_times.append(time.perf_counter() - start)
+        if i % 50 == 0:
+            await asyncio.sleep(0)
+    await asyncio.sleep(0.5)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for subscription in subscriptions:
+        subscription.queue = asyncio.Queue()
+        subscription.queue.put_nowait(None)
+    for consumer in consumers:
+        consumer.cancel()
+
+    dropped = sum(s.dropped for s in subscriptions)
+    print(f"{SUBSCRIBERS} subscribers, {EVENTS} events, buffer {BUFFER_SIZE}")
+    print(f"publish p50 {percentile(publish_times, 50) * 1e6:.0f} us, p99 {percentile(publish_times, 99) * 1e6:.0f} us")
+    print(f"delivery p50 {percentile(latencies, 50) * 1e3:.2f} ms, p99 {percentile(latencies, 99) * 1e3:.2f} ms")
+    print(f"delivered {len(latencies)}, dropped for slow consumers {dropped}")
+    print(f"peak traced memory {peak_memory / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
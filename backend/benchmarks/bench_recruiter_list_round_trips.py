@@ -0,0 +1,59 @@
+"""
+MongoDB round trips made by GET /recruiter as the list grows.
+
+Candidates are seeded without job_role_title (like legacy documents) spread
+over 20 job roles. The per-candidate lookup that used to be here costs one
+round trip per candidate; the batched lookup stays constant.
+"""
+import asyncio
+from datetime import datetime
+
+from bson import ObjectId
+from benchmarks.common import connect_bench_db, bench_user, command_counter, Timer
+from app.database import Database
+from app.routes.candidate import get_recruiter_candidates
+
+ROLE_COUNT = 20
+
+
+async def per_candidate_lookup(candidates):
+    """The previous implementation: one job_roles find_one per candidate."""
+    for candidate in candidates:
+        if "job_role_title" not in candidate:
+            job_role = await Database.get_collection("job_roles").find_one({"_id": ObjectId(candidate["job_role_id"])})
+            candidate["job_role_title"] = job_role["title"] if job_role else "Unknown Role"
+
+
+async def main():
+    db = await connect_bench_db()
+    roles = [{"_id": ObjectId(), "title": f"Role {i}", "company_id": "BENCH"} for i in range(ROLE_COUNT)]
+    await db.job_roles.insert_many(roles)
+
+    print(f"{'candidates':>10} {'old queries':>12} {'new queries':>12} {'new ms':>8}")
+    for size in (10, 100, 1000, 5000):
+        user = bench_user(user_id=f"recruiter-{size}")
+        await db.candidates.insert_many([
+            {
+                "candidate_name": f"Candidate {i}",
+                "recruiter_id": user.id,
+                "job_role_id": str(roles[i % ROLE_COUNT]["_id"]),
+                "status": "pending",
+                "created_at": datetime.utcnow(),
+            }
+            for i in range(size)
+        ])
+
+        command_counter.reset()
+        candidates = await db.candidates.find({"recruiter_id": user.id}).to_list(length=None)
+        await per_candidate_lookup(candidates)
+        old_trips = command_counter.queries
+
+        command_counter.reset()
+        with Timer() as timer:
+            await get_recruiter_candidates(current_user=user)
+        print(f"{size:>10} {old_trips:>12} {command_counter.queries:>12} {timer.elapsed * 1000:>8.1f}")
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
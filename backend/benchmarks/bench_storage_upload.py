@@ -0,0 +1,91 @@
+"""
+Throughput of concurrent 5 MB CV uploads through the local storage backend.
+
+Each upload goes through the request path: a chunked, size-limited read
+from a spooled UploadFile, then LocalStorage.save, both in the thread pool.
+The spooled files are prepared before timing starts, as the multipart
+parser would have done. A ticker task measures event-loop lag while the
+uploads run. The "inline" rows read and write the same files on the event
+loop for comparison.
+Set BENCH_UPLOAD_CONCURRENCY, BENCH_UPLOAD_COUNT and BENCH_UPLOAD_MB to
+change the load.
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from benchmarks.common import percentile, Timer
+from app.utils.storage import LocalStorage, read_upload, read_limited
+
+CONCURRENCY = [int(c) for c in os.getenv("BENCH_UPLOAD_CONCURRENCY", "1,8,32").split(",")]
+COUNT = int(os.getenv("BENCH_UPLOAD_COUNT", "64"))
+SIZE_MB = int(os.getenv("BENCH_UPLOAD_MB", "5"))
+
+
+def make_upload(content: bytes, index: int) -> UploadFile:
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(content)
+    spooled.seek(0)
+    return UploadFile(
+        file=spooled, filename=f"cv_{index}.pdf", headers=Headers({"content-type": "application/pdf"})
+    )
+
+
+async def measure_lag(stop: asyncio.Event, lags: list):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(0.005)
+        lags.append((loop.time() - start - 0.005) * 1000)
+
+
+async def run(storage: LocalStorage, payloads: list, concurrency: int, inline: bool):
+    semaphore = asyncio.Semaphore(concurrency)
+    uploads = [make_upload(content, i) for i, content in enumerate(payloads)]
+    latencies = []
+
+    async def upload(file: UploadFile):
+        async with semaphore:
+            with Timer() as timer:
+                if inline:
+                    data, content_hash = read_limited(file.file, len(payloads[0]), 1024 * 1024)
+                    relative = storage.relative_path(content_hash, file.filename)
+                    storage._write(os.path.join(storage.root, relative), data)
+                else:
+                    data, content_hash = await read_upload(file)
+                    await storage.save(data, file.filename, content_hash)
+            latencies.append(timer.elapsed * 1000)
+
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(measure_lag(stop, lags))
+    with Timer() as total:
+        await asyncio.gather(*(upload(file) for file in uploads))
+    stop.set()
+    await ticker
+    for file in uploads:
+        await file.close()
+    return total.elapsed, latencies, lags
+
+
+async def main():
+    payloads = [os.urandom(SIZE_MB * 1024 * 1024) for _ in range(COUNT)]
+    print(f"{'mode':<9} {'conc':>5} {'MB/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'loop lag p99 ms':>16}")
+    for inline in (False, True):
+        for concurrency in CONCURRENCY:
+            root = tempfile.mkdtemp(prefix="bench_storage_")
+            try:
+                elapsed, latencies, lags = await run(LocalStorage(root=root), payloads, concurrency, inline)
+            finally:
+                shutil.rmtree(root)
+            print(
+                f"{'inline' if inline else 'threaded':<9} {concurrency:>5} {COUNT * SIZE_MB / elapsed:>8.1f} "
+                f"{percentile(latencies, 50):>8.1f} {percentile(latencies, 99):>8.1f} {percentile(lags, 99):>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
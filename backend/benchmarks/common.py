@@ -0,0 +1,80 @@
+import os
+
+# Benchmarks write synthetic data, so never point them at the real database
+os.environ.setdefault("DATABASE_NAME", "cv_align_bench")
+
+import time
+from collections import Counter
+from pymongo import monitoring
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts MongoDB commands (round trips) by name."""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def reset(self):
+        self.counts.clear()
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def queries(self) -> int:
+        """Round trips excluding getMore batches of a cursor that is already open."""
+        return self.total - self.counts["getMore"]
+
+    def started(self, event):
+        self.counts[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# Registered before any client is created so every benchmark connection is counted
+command_counter = CommandCounter()
+monitoring.register(command_counter)
+
+
+async def connect_bench_db(drop: bool = True):
+    """Connect to the benchmark database, optionally starting from an empty one."""
+    from app.database import Database
+    await Database.connect_db()
+    if drop:
+        await Database.client.drop_database(Database.db.name)
+        await Database.connect_db()
+    return Database.db
+
+
+def bench_user(role: str = "recruiter", company_code: str = "BENCH", user_id: str = "bench-user"):
+    from app.models.user import User
+    return User(
+        id=user_id,
+        email=f"{role}@bench.example.com",
+        full_name=f"Bench {role}",
+        company_code=company_code,
+        role=role,
+        is_active=True
+    )
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
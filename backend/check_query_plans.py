@@ -0,0 +1,78 @@
+"""
+Explain the queries issued by each route and fail if any of them would
+scan a whole collection. Run against a database whose indexes were
+created by the app: `python check_query_plans.py` (exit code 1 on COLLSCAN).
+"""
+import asyncio
+import sys
+from bson import ObjectId
+from app.database import Database
+from app.utils.query_plan import find_stages
+
+SAMPLE_ID = ObjectId()
+
+# (route, collection, filter, sort)
+ROUTE_QUERIES = [
+    ("auth.get_current_user", "users", {"email": "user@example.com"}, None),
+    ("auth.signup", "companies", {"code": "ABCD1234"}, None),
+    ("company.register_company", "companies", {"website": "https://example.com"}, None),
+    ("job_role.get_job_roles", "job_roles", {"company_id": "ABCD1234"}, None),
+    ("job_role.get_top_job_roles", "job_roles", {"company_id": "ABCD1234"}, [("applications_count", -1)]),
+    ("job_role.get_job_role", "job_roles", {"_id": SAMPLE_ID, "company_id": "ABCD1234"}, None),
+    ("candidate.upload_candidate_cv", "candidates", {"job_role_id": str(SAMPLE_ID), "content_hash": "0" * 64}, None),
+    ("candidate.get_recruiter_candidates", "candidates", {"recruiter_id": str(SAMPLE_ID)}, None),
+    ("candidate.get_company_candidates", "candidates", {"company_id": "ABCD1234"}, None),
+    ("candidate.get_recruiter_candidates_page", "candidates", {"recruiter_id": str(SAMPLE_ID)}, [("created_at", -1), ("_id", -1)]),
+    ("candidate.get_company_candidates_page", "candidates", {"company_id": "ABCD1234"}, [("created_at", -1), ("_id", -1)]),
+    ("candidate.get_company_candidates_page (admin)", "candidates", {}, [("created_at", -1), ("_id", -1)]),
+    ("candidate.export_candidates", "candidates", {"company_id": "ABCD1234", "job_role_id": str(SAMPLE_ID)}, [("created_at", -1), ("_id", -1)]),
+    ("candidate.search_candidates", "candidates", {"$text": {"$search": "python"}, "company_id": "ABCD1234"}, None),
+    ("candidate.rank_candidates", "candidates", {"job_role_id": str(SAMPLE_ID), "status": "pending", "ats_score": {"$gte": 70}}, [("ats_score", -1), ("_id", -1)]),
+    ("candidate.rank_candidates (any status)", "candidates", {"job_role_id": str(SAMPLE_ID)}, [("ats_score", -1), ("_id", -1)]),
+    ("candidate.update_candidate_status", "candidates", {"_id": SAMPLE_ID}, None),
+    ("candidate.bulk_update_candidate_status", "candidates", {"_id": {"$in": [SAMPLE_ID]}}, None),
+    ("job_role.get_metrics (rollup)", "rollups", {"_id": f"recruiter:{SAMPLE_ID}"}, None),
+    ("job_role.get_metrics (roles)", "job_roles", {"company_id": "ABCD1234"}, None),
+    ("job_role.get_metrics (top recruiter)", "users", {"role": "recruiter", "company_code": "ABCD1234"}, [("accuracy", -1), ("_id", 1)]),
+    ("cascade.run (count, batches)", "candidates", {"job_role_id": str(SAMPLE_ID)}, None),
+    ("cascade.sweep_orphans (roles)", "job_roles", {"_id": {"$in": [SAMPLE_ID]}}, None),
+    ("users.get_all_recruiters", "users", {"role": "recruiter", "company_code": "ABCD1234"}, None),
+    ("users.get_top_recruiters", "users", {"role": "recruiter", "company_code": "ABCD1234"}, [("accuracy", -1), ("_id", 1)]),
+    ("users.get_admin_metrics", "api_metrics", {"granularity": "all"}, None),
+    ("users.api_calls_over_time", "api_metrics", {"granularity": "day", "bucket": {"$gte": SAMPLE_ID.generation_time}}, None),
+    ("users.endpoint_performance (window)", "api_metrics", {"granularity": "minute", "bucket": {"$gte": SAMPLE_ID.generation_time}}, None),
+]
+
+# (route, collection, key, filter)
+DISTINCT_QUERIES = [
+    ("cascade.sweep_orphans", "candidates", "job_role_id", {}),
+]
+
+
+async def explain(collection: str, query: dict, sort=None, distinct: str = None) -> list:
+    if distinct:
+        command = {"distinct": collection, "key": distinct, "query": query}
+    else:
+        command = {"find": collection, "filter": query}
+    if sort:
+        command["sort"] = dict(sort)
+    result = await Database.db.command({"explain": command, "verbosity": "queryPlanner"})
+    return find_stages(result["queryPlanner"]["winningPlan"])
+
+
+async def main() -> int:
+    await Database.connect_db()
+    failures = 0
+    queries = [(route, collection, query, sort, None) for route, collection, query, sort in ROUTE_QUERIES]
+    queries += [(route, collection, query, None, key) for route, collection, key, query in DISTINCT_QUERIES]
+    for route, collection, query, sort, key in queries:
+        stages = await explain(collection, query, sort, key)
+        uses_collscan = "COLLSCAN" in stages
+        failures += uses_collscan
+        print(f"{'FAIL' if uses_collscan else 'ok  '} {route:<40} {collection:<12} {' <- '.join(stages)}")
+    await Database.close_db()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,78 @@
+"""
+Check read routing and pool behaviour against a replica set.
+
+Start a local single-node replica set, for example:
+
+    docker run -d --name cv-align-rs -p 27017:27017 mongo:7 --replSet rs0
+    docker exec cv-align-rs mongosh --quiet --eval "rs.initiate()"
+    MONGODB_URL="mongodb://localhost:27017/?replicaSet=rs0" python check_read_routing.py
+
+The script prints which server and read preference served a primary read
+and an analytics read, then runs a burst of concurrent queries through a
+deliberately small pool and reports the checkout wait times. On a single
+node, secondaryPreferred falls back to the primary; add members to see
+analytics reads move to a secondary.
+"""
+import asyncio
+import os
+import sys
+from pymongo import monitoring
+
+CONCURRENCY = int(os.getenv("CHECK_CONCURRENCY", "200"))
+os.environ.setdefault("MONGO_MAX_POOL_SIZE", "10")
+
+
+class ServerRecorder(monitoring.CommandListener):
+    def __init__(self):
+        self.servers = {}
+
+    def started(self, event):
+        if event.command_name in ("find", "aggregate"):
+            read_preference = event.command.get("$readPreference", {}).get("mode", "primary")
+            self.servers[event.request_id] = (event.connection_id, read_preference)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+recorder = ServerRecorder()
+monitoring.register(recorder)
+
+from app.database import Database  # noqa: E402  (listeners must be registered before the client exists)
+from app.utils.mongo_pool import pool_monitor  # noqa: E402
+
+
+async def served_by(collection) -> tuple:
+    recorder.servers.clear()
+    await collection.find_one({})
+    return next(iter(recorder.servers.values()), (None, None))
+
+
+async def main() -> int:
+    await Database.connect_db()
+    hello = await Database.client.admin.command("hello")
+    if not hello.get("setName"):
+        print("Not connected to a replica set; start one as described in this script's docstring")
+        await Database.close_db()
+        return 1
+    print(f"replica set {hello['setName']}: primary {hello.get('primary')}, hosts {hello.get('hosts')}")
+
+    primary_server, primary_mode = await served_by(Database.get_collection("api_metrics"))
+    analytics_server, analytics_mode = await served_by(Database.get_analytics_collection("api_metrics"))
+    print(f"primary read   -> {primary_server} ({primary_mode})")
+    print(f"analytics read -> {analytics_server} ({analytics_mode})")
+
+    collection = Database.get_analytics_collection("api_metrics")
+    await asyncio.gather(*(collection.find_one({"granularity": "all"}) for _ in range(CONCURRENCY)))
+    print(f"{CONCURRENCY} concurrent reads through a pool of {os.environ['MONGO_MAX_POOL_SIZE']}:")
+    for key, value in pool_monitor.stats().items():
+        print(f"  {key}: {value}")
+    await Database.close_db()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
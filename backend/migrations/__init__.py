@@ -0,0 +1 @@
+"""One-off data migrations. Run from backend/ with `python -m migrations.<name>`."""
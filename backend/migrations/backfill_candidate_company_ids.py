@@ -0,0 +1,17 @@
+"""Write company_id onto legacy candidate documents so tenant queries can use the company index."""
+import asyncio
+from app.database import Database
+from migrations.common import copy_job_role_field
+
+
+async def backfill_candidate_company_ids():
+    await Database.connect_db()
+    updated, orphaned = await copy_job_role_field("company_id", "company_id")
+    print(f"Backfilled company_id on {updated} candidates")
+    if orphaned:
+        print(f"Skipped {orphaned} candidates whose job role no longer exists")
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_candidate_company_ids())
@@ -0,0 +1,17 @@
+"""Write job_role_title onto legacy candidate documents that were stored without it."""
+import asyncio
+from app.database import Database
+from migrations.common import copy_job_role_field
+
+
+async def backfill_job_role_titles():
+    await Database.connect_db()
+    updated, orphaned = await copy_job_role_field("title", "job_role_title")
+    print(f"Backfilled job_role_title on {updated} candidates")
+    if orphaned:
+        print(f"Skipped {orphaned} candidates whose job role no longer exists")
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_job_role_titles())
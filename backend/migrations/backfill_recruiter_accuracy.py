@@ -0,0 +1,15 @@
+"""Store accuracy on recruiter documents from their current counters."""
+import asyncio
+from app.database import Database
+from app.utils.rollups import ACCURACY_STAGE
+
+
+async def backfill_recruiter_accuracy():
+    await Database.connect_db()
+    result = await Database.get_collection("users").update_many({"role": "recruiter"}, [ACCURACY_STAGE])
+    print(f"Stored accuracy on {result.modified_count} recruiters")
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_recruiter_accuracy())
@@ -0,0 +1,37 @@
+"""Helpers shared by the migrations."""
+from typing import Tuple
+from bson import ObjectId
+from app.database import Database
+
+
+async def copy_job_role_field(job_role_field: str, candidate_field: str) -> Tuple[int, int]:
+    """
+    Copy a job role field onto the candidates of that role that don't have
+    `candidate_field` yet. Returns (updated, orphaned): orphaned candidates
+    belong to a job role that no longer exists and are left alone.
+    """
+    candidates = Database.get_collection("candidates")
+    job_roles = Database.get_collection("job_roles")
+
+    pipeline = [
+        {"$match": {candidate_field: {"$exists": False}}},
+        {"$group": {"_id": "$job_role_id", "count": {"$sum": 1}}}
+    ]
+    missing = await candidates.aggregate(pipeline).to_list(length=None)
+    role_ids = [ObjectId(m["_id"]) for m in missing if m["_id"] and ObjectId.is_valid(m["_id"])]
+    roles = await job_roles.find({"_id": {"$in": role_ids}}, {job_role_field: 1}).to_list(length=None)
+    values = {str(r["_id"]): r.get(job_role_field) for r in roles}
+
+    updated = 0
+    orphaned = 0
+    for group in missing:
+        value = values.get(group["_id"])
+        if value is None:
+            orphaned += group["count"]
+            continue
+        result = await candidates.update_many(
+            {"job_role_id": group["_id"], candidate_field: {"$exists": False}},
+            {"$set": {candidate_field: value}}
+        )
+        updated += result.modified_count
+    return updated, orphaned
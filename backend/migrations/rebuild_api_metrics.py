@@ -0,0 +1,57 @@
+"""
+Rebuild the api_metrics rollups from the raw api_logs that are still retained.
+
+Entries logged before route templates were recorded carry raw paths such as
+/candidates/<id>; they are rewritten to their route template first so each
+route has one set of buckets.
+"""
+import asyncio
+from app.database import Database
+from app.utils.api_log import UNMATCHED_PATH, template_for_path
+from app.utils.api_metrics import api_metrics_updates
+
+BATCH_SIZE = 5000
+
+
+async def normalize_log_paths(api_logs) -> int:
+    from app.main import app
+    rewritten = 0
+    for group in await api_logs.aggregate([{"$group": {"_id": {"path": "$path", "method": "$method"}}}]).to_list(length=None):
+        path, method = group["_id"].get("path"), group["_id"].get("method") or "GET"
+        if not path or path == UNMATCHED_PATH or "{" in path:
+            continue
+        template = template_for_path(app.routes, path, method)
+        if template != path:
+            result = await api_logs.update_many({"path": path, "method": method}, {"$set": {"path": template}})
+            rewritten += result.modified_count
+    return rewritten
+
+
+async def rebuild_api_metrics():
+    await Database.connect_db()
+    api_logs = Database.get_collection("api_logs")
+    api_metrics = Database.get_collection("api_metrics")
+
+    rewritten = await normalize_log_paths(api_logs)
+    print(f"Rewrote {rewritten} log entries to their route templates")
+
+    # Rebuilding is not additive, so start from empty buckets
+    await api_metrics.delete_many({})
+    processed = 0
+    batch = []
+    async for entry in api_logs.find({}, {"path": 1, "timestamp": 1, "duration": 1, "response_time": 1}):
+        batch.append(entry)
+        if len(batch) == BATCH_SIZE:
+            await api_metrics.bulk_write(api_metrics_updates(batch), ordered=False)
+            processed += len(batch)
+            batch = []
+    if batch:
+        await api_metrics.bulk_write(api_metrics_updates(batch), ordered=False)
+        processed += len(batch)
+
+    print(f"Rebuilt API metrics from {processed} log entries")
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_api_metrics())
@@ -0,0 +1,21 @@
+"""
+Drop and recreate the indexes whose definition in app/indexes.py changed.
+Startup only creates missing indexes; run this once, from one process,
+after changing an index definition.
+"""
+import asyncio
+from app.database import Database
+from app.indexes import rebuild_changed_indexes
+
+
+async def main():
+    await Database.connect_db()
+    rebuilt = await rebuild_changed_indexes(Database.db)
+    for name in rebuilt:
+        print(f"Rebuilt {name}")
+    print(f"Rebuilt {len(rebuilt)} index(es)")
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,18 @@
+"""Rebuild the dashboard rollups and counters from the candidates collection."""
+import asyncio
+from app.database import Database
+from app.utils.rollups import reconcile_rollups
+
+
+async def main():
+    await Database.connect_db()
+    summary = await reconcile_rollups()
+    print(
+        f"Corrected {summary['rollups']} rollups, {summary['job_roles']} job role counters "
+        f"and {summary['users']} recruiter counters"
+    )
+    await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())